@@ -1,18 +1,6 @@
-import whisper
-import datetime
 import argparse
 from pathlib import Path
-from whisper.audio import load_audio
-import torch
-
-def format_timestamp(seconds: float):
-    td = datetime.timedelta(seconds=seconds)
-    total_seconds = int(td.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
-    millis = int(td.microseconds / 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+from onewordai.core.srt import build_srt, STRIP_CHARS
 
 
 def process_subtitles(input_path, model_type, output_dir):
@@ -26,54 +14,46 @@ def process_subtitles(input_path, model_type, output_dir):
     save_dir.mkdir(parents=True, exist_ok=True)
     output_filename = save_dir / f"{video_path.stem}_subs.srt"
 
-    # Prevent CPU overload
-    torch.set_num_threads(4)
+    # Heavy imports (torch, whisper, CTranslate2) only once there is work to do
+    from onewordai.core import threads  # noqa: F401  (sets thread counts before torch loads)
+    from onewordai.core.engine import SubtitleGenerator
+    from onewordai.core.engine_ct2 import FasterWhisperEngine
 
-    print(f"\n📦 Loading Whisper model: {model_type} ...")
-    model = whisper.load_model(model_type)
+    print(f"\n📦 Loading faster-whisper model: {model_type} ...")
+    model = FasterWhisperEngine(model_type)
 
-    print(f"🎵 Reading audio...")
-    audio = load_audio(str(video_path))
-    audio_duration = len(audio) / 16000
-    print(f"⏱ Audio Duration: {audio_duration:.2f} seconds")
+    # Same decode as the package: whisper's ffmpeg loader, or faster-whisper's PyAV one
+    audio, audio_duration = SubtitleGenerator(model_type)._read_audio(str(video_path))
 
     print(f"\n🧠 Transcribing started...\n")
 
-    # Run transcription
-    result = model.transcribe(
-        str(video_path),
-        word_timestamps=True,
-        verbose=False
+    # Run transcription on the decoded samples (avoids a second ffmpeg decode)
+    segments, info = model.transcribe(
+        audio,
+        word_timestamps=True
     )
 
-    # Progress display
+    # Single pass: report progress and collect cleaned words as segments are decoded
+    starts, ends, texts = [], [], []
     last_percent = 0
-    for segment in result["segments"]:
-        processed_time = segment["end"]
-        percent = (processed_time / audio_duration) * 100
+    for segment in segments:
+        for w in segment["words"]:
+            word = w["word"].translate(STRIP_CHARS).strip()
+            if word:
+                starts.append(w["start"])
+                ends.append(w["end"])
+                texts.append(word)
+
+        percent = (segment["end"] / audio_duration) * 100
         if percent - last_percent >= 5:  # update every 5%
             print(f"Progress: {percent:.1f}%")
             last_percent = percent
 
     print("Progress: 100.0% ✅\n")
 
-    # Write SRT
+    # Write SRT (one buffer, one write)
     print("✍ Writing subtitles...")
-    with open(output_filename, "w", encoding="utf-8") as f:
-        counter = 1
-        for segment in result["segments"]:
-            for word_data in segment["words"]:
-                word = word_data["word"].strip().replace(",", "")
-                if not word:
-                    continue
-
-                start = word_data["start"]
-                end = word_data["end"]
-
-                f.write(f"{counter}\n")
-                f.write(f"{format_timestamp(start)} --> {format_timestamp(end)}\n")
-                f.write(f"{word}\n\n")
-                counter += 1
+    output_filename.write_bytes(build_srt(starts, ends, texts).encode("utf-8"))
 
     print(f"\n✅ Success! Subtitles saved to: {output_filename}")
 
@@ -2,20 +2,45 @@
 FastAPI backend for OneWord AI Subtitle Generator.
 Handles file uploads, transcription processing, and SRT downloads.
 """
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, ConfigDict
 from pathlib import Path
-import uuid
+import os
+import json
 import shutil
+import uuid
 import asyncio
-from typing import Optional, Dict
-from datetime import datetime
+import aiofiles
+import functools
+import logging
+import threading
+import time
+from typing import Optional
+
+from onewordai.core.engine import SubtitleGenerator, release_gpu_cache
+from onewordai.api.store import create_job_store, create_job_queue, JobQueue, JOB_TTL, HEARTBEAT_TTL
+from onewordai.api import worker
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized by orjson (C) instead of json.dumps."""
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
 
-from onewordai.core.engine import SubtitleGenerator
 
-app = FastAPI(title="OneWord AI Subtitle Generator")
+# Status polling is the hot path, so use orjson when it's installed
+app = FastAPI(
+    title="OneWord AI Subtitle Generator",
+    default_response_class=ORJSONResponse if orjson else JSONResponse
+)
 
 # CORS middleware
 app.add_middleware(
@@ -26,14 +51,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+logger = logging.getLogger(__name__)
+
 # Directories
 UPLOAD_DIR = Path("uploads")
 OUTPUT_DIR = Path("outputs")
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-# Job storage (in-memory, replace with Redis for production)
-jobs: Dict[str, dict] = {}
+# Job storage (Redis when ONEWORD_REDIS_URL is set, in-memory otherwise)
+jobs = create_job_store()
+
+# How often expired uploads and SRT files are swept from disk
+JANITOR_INTERVAL = 3600
+
+# Model loaded at startup so the first job doesn't pay the load (empty to disable)
+PREWARM_MODEL = os.environ.get("ONEWORD_PREWARM_MODEL", "medium")
+
+# Upload chunk size (4 MB keeps the event loop responsive during large uploads)
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Upload limits (the web UI also caps files at 100 MB); 0 disables the duration cap
+MAX_UPLOAD_BYTES = int(os.environ.get("ONEWORD_MAX_UPLOAD_MB", "100")) * 1024 * 1024
+MAX_DURATION = float(os.environ.get("ONEWORD_MAX_DURATION", "0"))
+
+# Keep each upload's decoded 16 kHz audio (uploads/<file_id>.pcm, ~230 MB per hour)
+# so re-processing it with another mode or model skips ffmpeg
+CACHE_AUDIO = os.environ.get("ONEWORD_CACHE_AUDIO", "0") == "1"
+
+# ffprobe rejects corrupt/empty files in milliseconds, before any model is loaded
+FFPROBE = shutil.which("ffprobe")
+PROBE_TIMEOUT = 5
+
+# Behind nginx: internal location aliased to OUTPUT_DIR (e.g. /internal/outputs/).
+# Downloads then only send an X-Accel-Redirect header and nginx streams the file
+# itself with sendfile. Empty to serve files from Python.
+XACCEL_PREFIX = os.environ.get("ONEWORD_XACCEL_PREFIX", "")
+
+# Seconds between SSE keep-alive comments when a job is quiet (e.g. queued or loading)
+STREAM_KEEPALIVE = 15
+
+# One transcription at a time on the model, so concurrent jobs queue instead of OOM'ing
+# (per process: every web-server worker without Celery loads and runs its own model)
+model_lock = threading.Semaphore(1)
+
+# Pending jobs, run one at a time in arrival order by job_scheduler
+job_queue: Optional[JobQueue] = None
+
+# Times a job is re-queued after the worker running it died, before it's marked failed
+MAX_JOB_RETRIES = int(os.environ.get("ONEWORD_JOB_RETRIES", "2"))
 
 
 class JobStatus:
@@ -44,50 +110,240 @@ class JobStatus:
     CANCELLED = "cancelled"
 
 
+# Terminal states (a job never leaves these)
+JOB_DONE = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobStatusResponse(BaseModel):
+    """Public view of a job (internal fields like output paths are dropped)."""
+    model_config = ConfigDict(extra="ignore")
+    
+    job_id: str
+    status: str
+    progress: int = 0
+    status_message: Optional[str] = None
+    model: Optional[str] = None
+    language: Optional[str] = None
+    mode: Optional[str] = None
+    quality: Optional[str] = None
+    error: Optional[str] = None
+    # Unix epoch seconds
+    created_at: Optional[int] = None
+    completed_at: Optional[int] = None
+
+
+@functools.lru_cache(maxsize=4)
+def get_generator(model_name: str) -> SubtitleGenerator:
+    """Shared generator per model, so weights stay in memory across jobs (and Celery tasks)."""
+    return SubtitleGenerator(model_name=model_name)
+
+
+def prewarm_task(model_name: str):
+    """Load a model ahead of the first request."""
+    try:
+        with model_lock:
+            get_generator(model_name).load_model()
+    except Exception as e:
+        print(f"⚠️ Warning: Could not prewarm model {model_name}: {e}")
+
+
 def process_video_task(
     job_id: str,
     input_path: str,
     model: str,
     language: Optional[str],
-    mode: str
+    mode: str,
+    quality: str = "fast"
 ):
     """Background task to process video."""
     try:
-        jobs[job_id]["status"] = JobStatus.PROCESSING
-        jobs[job_id]["progress"] = 0
+        jobs.update(job_id, status=JobStatus.PROCESSING, progress=0)
         
-        # Create generator
-        generator = SubtitleGenerator(model_name=model)
+        # Reuse the cached generator for this model
+        generator = get_generator(model)
         
         # Process
         output_path = OUTPUT_DIR / f"{job_id}.srt"
+        # Uploads are saved as <file_id><ext>, so the cache sits beside them
+        audio_cache = None
+        if CACHE_AUDIO and Path(input_path).suffix != ".pcm":
+            audio_cache = str(Path(input_path).with_suffix(".pcm"))
+        
+        last_progress = [-1]
         
         def progress_callback(percent):
-            jobs[job_id]["progress"] = percent
+            # Backends report fractions; store whole percents (JobStatusResponse.progress
+            # is an int) and skip updates that don't change the value
+            percent = int(percent)
+            if percent != last_progress[0]:
+                last_progress[0] = percent
+                jobs.update(job_id, progress=percent)
             
         def status_callback(msg):
-            jobs[job_id]["status_message"] = msg
+            jobs.update(job_id, status_message=msg)
         
-        generator.process(
-            input_path=input_path,
-            output_path=str(output_path),
-            language=language,
-            mode=mode,
-            progress_callback=progress_callback,
-            status_callback=status_callback
-        )
+        if not model_lock.acquire(blocking=False):
+            status_callback("⏳ Waiting for the current job to finish...")
+            model_lock.acquire()
+        
+        try:
+            generator.process(
+                input_path=input_path,
+                output_path=str(output_path),
+                language=language,
+                mode=mode,
+                progress_callback=progress_callback,
+                status_callback=status_callback,
+                quality=quality,
+                audio_cache=audio_cache
+            )
+        finally:
+            model_lock.release()
         
-        jobs[job_id]["status"] = JobStatus.COMPLETED
-        jobs[job_id]["progress"] = 100
-        jobs[job_id]["output_file"] = str(output_path)
-        jobs[job_id]["completed_at"] = datetime.now().isoformat()
+        jobs.update(
+            job_id,
+            status=JobStatus.COMPLETED,
+            progress=100,
+            output_file=str(output_path),
+            # Saved so downloads can skip the stat() call (JSON-friendly for Redis)
+            output_stat=list(output_path.stat()),
+            completed_at=int(time.time())
+        )
         
     except Exception as e:
-        jobs[job_id]["status"] = JobStatus.FAILED
-        jobs[job_id]["error"] = str(e)
+        jobs.update(job_id, status=JobStatus.FAILED, error=str(e))
         print(f"❌ Job {job_id} failed: {e}")
 
 
+async def job_scheduler():
+    """
+    Run pending jobs one at a time, in the order they were queued.
+    
+    A job is taken off the queue only when the previous one has finished,
+    so it starts as soon as the model is free with no collection delay.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        job = await job_queue.get()
+        # Skip jobs cancelled (or expired) while they were queued
+        queued = await jobs.aget(job[0])
+        if queued is not None and queued["status"] != JobStatus.CANCELLED:
+            await loop.run_in_executor(None, process_video_task, *job)
+        await job_queue.done(job)
+        
+        # Idle: hand cached GPU blocks back (only here, never between files)
+        if await job_queue.empty():
+            await loop.run_in_executor(None, release_gpu_cache)
+
+
+async def requeue_orphans():
+    """
+    Put jobs taken by dead schedulers back on the queue.
+    
+    Only a job that had started (PROCESSING) counts as a retry; one that was
+    taken but never started is simply re-queued. After MAX_JOB_RETRIES
+    retries the job is marked failed instead.
+    """
+    for job in await job_queue.reclaim():
+        queued = await jobs.aget(job[0])
+        if queued is None or queued["status"] in JOB_DONE:
+            continue
+        retries = queued.get("retries", 0)
+        if queued["status"] == JobStatus.PROCESSING:
+            retries += 1
+            if retries > MAX_JOB_RETRIES:
+                await jobs.aupdate(job[0], status=JobStatus.FAILED, retries=retries,
+                                   error="Worker stopped while processing this job")
+                continue
+        await jobs.aupdate(job[0], status=JobStatus.PENDING, progress=0, retries=retries,
+                           status_message="🔁 Server restarted - job re-queued...")
+        await job_queue.put(job)
+
+
+async def queue_keeper():
+    """
+    Keep this scheduler's heartbeat alive and re-queue jobs whose worker died.
+    Only does anything with the Redis queue (see requeue_orphans).
+    """
+    while True:
+        await job_queue.heartbeat()
+        await requeue_orphans()
+        await asyncio.sleep(HEARTBEAT_TTL / 3)
+
+
+def sweep_files():
+    """Delete uploads and SRT files older than the job TTL (their index entries expire too)."""
+    cutoff = time.time() - JOB_TTL
+    for directory in (UPLOAD_DIR, OUTPUT_DIR):
+        # Relative dirs move with the working directory, and may be removed by hand
+        if not directory.is_dir():
+            continue
+        for path in directory.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+
+async def file_janitor():
+    """Periodically remove files whose jobs and uploads have expired."""
+    loop = asyncio.get_running_loop()
+    while True:
+        # One failed sweep must not stop the janitor for the life of the server
+        try:
+            await loop.run_in_executor(None, sweep_files)
+        except Exception:
+            logger.exception("File sweep failed")
+        await asyncio.sleep(JANITOR_INTERVAL)
+
+
+async def probe_media(input_path: str) -> Optional[float]:
+    """
+    Validate a media file with ffprobe.
+    Returns its duration in seconds, or None if it has no readable audio stream.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        FFPROBE, "-v", "error",
+        "-show_entries", "stream=codec_type:format=duration",
+        "-of", "json", input_path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(), timeout=PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        proc.kill()
+        return None
+    
+    if proc.returncode != 0:
+        return None
+    
+    info = json.loads(out or b"{}")
+    if not any(stream.get("codec_type") == "audio" for stream in info.get("streams", [])):
+        return None
+    return float(info.get("format", {}).get("duration") or 0)
+
+
+@app.on_event("startup")
+async def start_background_workers():
+    """Start the job scheduler and janitor, and load the default model in the background."""
+    global job_queue
+    app.state.janitor = asyncio.create_task(file_janitor())
+    
+    # With Celery workers transcribing, the API process never needs a model or scheduler
+    if worker.celery is not None:
+        return
+    
+    job_queue = create_job_queue(jobs)
+    # Heartbeat before the first job is taken, so no other scheduler reclaims it
+    await job_queue.heartbeat()
+    app.state.keeper = asyncio.create_task(queue_keeper())
+    app.state.scheduler = asyncio.create_task(job_scheduler())
+    
+    if PREWARM_MODEL:
+        asyncio.get_running_loop().run_in_executor(None, prewarm_task, PREWARM_MODEL)
+
 
 @app.get("/api/health")
 async def health_check():
@@ -95,6 +351,41 @@ async def health_check():
     return {"status": "ok", "service": "OneWord AI Subtitle Generator"}
 
 
+async def _read_chunks(file: UploadFile):
+    """Yield an UploadFile in UPLOAD_CHUNK_SIZE pieces."""
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+async def _save_upload(filename: str, chunks) -> dict:
+    """Stream chunks to a new file in UPLOAD_DIR and index it under a fresh file_id."""
+    # Generate unique file ID
+    file_id = str(uuid.uuid4())
+    file_ext = Path(filename).suffix
+    file_path = UPLOAD_DIR / f"{file_id}{file_ext}"
+    
+    # Save file in chunks without blocking the event loop
+    size = 0
+    async with aiofiles.open(file_path, "wb") as buffer:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                break
+            await buffer.write(chunk)
+    
+    if size > MAX_UPLOAD_BYTES:
+        file_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=413, detail=f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)}MB)")
+    
+    await jobs.aset_upload(file_id, str(file_path))
+    
+    return {
+        "file_id": file_id,
+        "filename": filename,
+        "size": size
+    }
+
+
 @app.post("/api/upload")
 async def upload_file(file: UploadFile = File(...)):
     """
@@ -104,41 +395,42 @@ async def upload_file(file: UploadFile = File(...)):
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
-    # Generate unique file ID
-    file_id = str(uuid.uuid4())
-    file_ext = Path(file.filename).suffix
-    file_path = UPLOAD_DIR / f"{file_id}{file_ext}"
+    return await _save_upload(file.filename, _read_chunks(file))
+
+
+@app.post("/api/upload_raw")
+async def upload_raw(request: Request, filename: str):
+    """
+    Upload a video/audio file sent as the raw request body.
+    Skips multipart parsing and its temporary spool file. Returns a file_id like /api/upload.
+    """
+    if not filename:
+        raise HTTPException(status_code=400, detail="No file provided")
     
-    # Save file
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Refuse oversized uploads before reading the body when the client declares a length
+    if int(request.headers.get("content-length") or 0) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)}MB)")
     
-    return {
-        "file_id": file_id,
-        "filename": file.filename,
-        "size": file_path.stat().st_size
-    }
+    return await _save_upload(filename, request.stream())
 
 
 @app.post("/api/process")
 async def process_file(
-    background_tasks: BackgroundTasks,
     file_id: str = Form(...),
     model: str = Form("medium"),
     language: Optional[str] = Form(None),
-    mode: str = Form("oneword")
+    mode: str = Form("oneword"),
+    quality: str = Form("fast")
 ):
     """
     Start processing a previously uploaded file.
     Returns a job_id to track progress.
     """
-    # Find uploaded file
-    uploaded_files = list(UPLOAD_DIR.glob(f"{file_id}.*"))
-    if not uploaded_files:
+    # Find uploaded file (indexed at upload time, no directory scan)
+    input_path = await jobs.aget_upload(file_id)
+    if input_path is None:
         raise HTTPException(status_code=404, detail="File not found")
     
-    input_path = str(uploaded_files[0])
-    
     # Validate inputs
     allowed_models = ["medium", "large"]
     if model not in allowed_models:
@@ -150,9 +442,20 @@ async def process_file(
     if mode not in ["oneword", "twoword", "phrase"]:
         raise HTTPException(status_code=400, detail="Invalid mode")
     
+    if quality not in ["fast", "accurate"]:
+        raise HTTPException(status_code=400, detail="Invalid quality")
+    
+    # Reject unreadable files before a job (and a model load) is spent on them
+    if FFPROBE:
+        duration = await probe_media(input_path)
+        if duration is None:
+            raise HTTPException(status_code=400, detail="Unsupported or corrupt media file")
+        if MAX_DURATION and duration > MAX_DURATION:
+            raise HTTPException(status_code=400, detail=f"Media too long (max {MAX_DURATION:.0f} seconds)")
+    
     # Create job
     job_id = str(uuid.uuid4())
-    jobs[job_id] = {
+    await jobs.acreate(job_id, {
         "job_id": job_id,
         "file_id": file_id,
         "status": JobStatus.PENDING,
@@ -161,61 +464,111 @@ async def process_file(
         "model": model,
         "language": language,
         "mode": mode,
-        "created_at": datetime.now().isoformat()
-    }
+        "quality": quality,
+        "created_at": int(time.time())
+    })
     
-    # Start background task
-    background_tasks.add_task(
-        process_video_task,
-        job_id, input_path, model, language, mode
-    )
+    # Hand off to the Celery workers when configured, else the in-process scheduler
+    job = (job_id, input_path, model, language, mode, quality)
+    if worker.celery is not None:
+        await asyncio.get_running_loop().run_in_executor(None, worker.transcribe_job.delay, *job)
+    else:
+        await job_queue.put(job)
     
     return {"job_id": job_id}
 
 
-@app.get("/api/status/{job_id}")
+@app.get("/api/status/{job_id}", response_model=JobStatusResponse)
 async def get_status(job_id: str):
     """Get processing status for a job."""
-    if job_id not in jobs:
+    job = await jobs.aget(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job
+
+
+@app.get("/api/stream/{job_id}")
+async def stream_status(job_id: str, request: Request):
+    """
+    Push job status as Server-Sent Events until the job finishes.
+    Each event carries the same JSON as /api/status; that endpoint remains for non-SSE clients.
+    """
+    if await jobs.aget(job_id) is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return jobs[job_id]
+    async def events():
+        async with jobs.subscribe(job_id) as updates:
+            # Re-read once subscribed so no update in between is missed
+            current = await jobs.aget(job_id)
+            while current is not None:
+                yield f"data: {JobStatusResponse.model_validate(current).model_dump_json()}\n\n"
+                if current["status"] in JOB_DONE:
+                    return
+                while True:
+                    try:
+                        fields = await asyncio.wait_for(updates.get(), STREAM_KEEPALIVE)
+                        break
+                    except asyncio.TimeoutError:
+                        if await request.is_disconnected():
+                            return
+                        yield ": keep-alive\n\n"
+                current = {**current, **fields}
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Stop nginx-style proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.get("/api/download/{job_id}")
 async def download_srt(job_id: str):
     """Download the generated SRT file."""
-    if job_id not in jobs:
+    job = await jobs.aget(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs[job_id]
-    
     if job["status"] != JobStatus.COMPLETED:
         raise HTTPException(status_code=400, detail="Job not completed yet")
     
     output_file = Path(job["output_file"])
+    filename = f"subtitles_{job['mode']}.srt"
+    
+    if XACCEL_PREFIX:
+        return Response(
+            media_type="application/x-subrip",
+            headers={
+                "X-Accel-Redirect": XACCEL_PREFIX.rstrip("/") + "/" + output_file.name,
+                "Content-Disposition": f'attachment; filename="{filename}"'
+            }
+        )
+    
+    # Checked even with a cached stat: the SRT may have been swept or deleted since
     if not output_file.exists():
         raise HTTPException(status_code=404, detail="Output file not found")
     
+    # Cached stat saves Starlette its threaded os.stat (it also sets Accept-Ranges itself)
+    stat_result = os.stat_result(job["output_stat"]) if job.get("output_stat") else None
     return FileResponse(
         output_file,
         media_type="application/x-subrip",
-        filename=f"subtitles_{job['mode']}.srt"
+        filename=filename,
+        stat_result=stat_result
     )
 
 
 @app.post("/api/cancel/{job_id}")
 async def cancel_job(job_id: str):
     """Cancel a running job."""
-    if job_id not in jobs:
+    job = await jobs.aget(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs[job_id]
-    
     # Only cancel if still processing
     if job["status"] in [JobStatus.PENDING, JobStatus.PROCESSING]:
-        jobs[job_id]["status"] = JobStatus.CANCELLED
-        jobs[job_id]["status_message"] = "❌ Cancelled by user"
+        await jobs.aupdate(job_id, status=JobStatus.CANCELLED, status_message="❌ Cancelled by user")
         return {"message": "Job cancelled successfully"}
     else:
         return {"message": f"Job already {job['status']}"}
@@ -256,7 +609,15 @@ def start_server():
     
     threading.Thread(target=open_browser, daemon=True).start()
     
+    # Limit CUDA allocator fragmentation (inherited by worker processes)
+    os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "max_split_size_mb:128")
+    
+    # Without Celery every worker process loads its own model and transcribes on its
+    # own, so only fan out when Celery workers do the transcription (needs Redis)
+    default_workers = max(1, (os.cpu_count() or 2) // 2) if worker.celery is not None else 1
+    workers = int(os.environ.get("ONEWORD_WORKERS", default_workers))
+    
     # Run server
-    print("✨ Starting OneWord AI Web Server...")
+    print(f"✨ Starting OneWord AI Web Server ({workers} worker{'s' if workers > 1 else ''})...")
     # Use reload=False for production package usage
-    uvicorn.run("onewordai.api.main:app", host="0.0.0.0", port=8000, reload=False)
+    uvicorn.run("onewordai.api.main:app", host="0.0.0.0", port=8000, reload=False, workers=workers)
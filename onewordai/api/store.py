@@ -0,0 +1,334 @@
+"""
+Job state, upload index and pending-job queue storage for the API.
+Uses Redis when ONEWORD_REDIS_URL is set (shared by all uvicorn workers and
+kept across restarts), otherwise in-process structures. Stores expire entries
+after JOB_TTL seconds.
+Request handlers use the awaitable a* methods; worker threads use the sync ones.
+Every job update is also pushed to subscribers (see subscribe) for live streaming.
+"""
+import asyncio
+import contextlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+try:
+    import redis
+    import redis.asyncio
+except ImportError:
+    redis = None
+
+REDIS_URL = os.environ.get("ONEWORD_REDIS_URL")
+
+# How long jobs, uploads and their files are kept after their last update
+JOB_TTL = int(os.environ.get("ONEWORD_JOB_TTL", "86400"))
+
+# Pending jobs (Redis list of JSON arrays); each scheduler moves the jobs it
+# takes to its own queue:taken:<id> list until they finish
+QUEUE_KEY = "queue:jobs"
+
+# Longest single blocking wait for a job (get() without a timeout repeats it)
+BLOCK_SECONDS = 5
+
+# Seconds a scheduler's heartbeat lives; once it lapses its taken jobs are reclaimed
+HEARTBEAT_TTL = 30
+
+
+class JobStore:
+    """In-process job store with TTL eviction (single worker only)."""
+
+    shared = False
+
+    def __init__(self, ttl: int = JOB_TTL):
+        self.ttl = ttl
+        self._jobs: Dict[str, dict] = {}
+        self._expires: Dict[str, float] = {}
+        self._uploads: Dict[str, tuple] = {}
+        # job_id -> [(event loop, queue)] of open subscriptions
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, job: dict):
+        """Register a new job."""
+        with self._lock:
+            self._evict()
+            self._jobs[job_id] = dict(job)
+            self._expires[job_id] = time.time() + self.ttl
+
+    def update(self, job_id: str, **fields):
+        """Set one or more fields on an existing job and refresh its TTL."""
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+                self._expires[job_id] = time.time() + self.ttl
+            # Updates come from worker threads, so hand them to each subscriber's loop
+            for loop, queue in self._subscribers.get(job_id, ()):
+                loop.call_soon_threadsafe(queue.put_nowait, dict(fields))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return a copy of the job, or None if unknown or expired."""
+        with self._lock:
+            if self._expires.get(job_id, 0) < time.time():
+                return None
+            return dict(self._jobs[job_id])
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    def set_upload(self, file_id: str, path: str):
+        """Remember where an upload was saved."""
+        with self._lock:
+            self._evict()
+            self._uploads[file_id] = (path, time.time() + self.ttl)
+
+    def get_upload(self, file_id: str) -> Optional[str]:
+        """Saved path of an upload, or None if unknown or expired."""
+        with self._lock:
+            path, expires = self._uploads.get(file_id, (None, 0))
+            return path if expires >= time.time() else None
+
+    # Awaitable variants for request handlers (dict operations never block)
+    async def acreate(self, job_id: str, job: dict):
+        self.create(job_id, job)
+
+    async def aupdate(self, job_id: str, **fields):
+        self.update(job_id, **fields)
+
+    async def aget(self, job_id: str) -> Optional[dict]:
+        return self.get(job_id)
+
+    async def aset_upload(self, file_id: str, path: str):
+        self.set_upload(file_id, path)
+
+    async def aget_upload(self, file_id: str) -> Optional[str]:
+        return self.get_upload(file_id)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Queue receiving the fields of every update to job_id while the context is open."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                self._subscribers[job_id].remove(subscriber)
+                if not self._subscribers[job_id]:
+                    del self._subscribers[job_id]
+
+    def _evict(self):
+        now = time.time()
+        for job_id in [j for j, t in self._expires.items() if t < now]:
+            del self._jobs[job_id]
+            del self._expires[job_id]
+        for file_id in [f for f, (_, t) in self._uploads.items() if t < now]:
+            del self._uploads[file_id]
+
+
+class RedisJobStore(JobStore):
+    """
+    Job store backed by Redis hashes (job:<id>), shared across workers.
+    
+    Worker threads use a blocking client; request handlers use a
+    redis.asyncio client so lookups never stall the event loop. Updates
+    are also published on progress:<id>, so any API worker can stream
+    jobs run by another worker (or a Celery worker).
+    """
+
+    shared = True
+
+    def __init__(self, url: str, ttl: int = JOB_TTL):
+        self.ttl = ttl
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.aclient = redis.asyncio.Redis.from_url(url, decode_responses=True)
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _channel(job_id: str) -> str:
+        return f"progress:{job_id}"
+
+    @staticmethod
+    def _encode(fields: dict) -> dict:
+        return {k: json.dumps(v) for k, v in fields.items()}
+
+    @staticmethod
+    def _decode(data: dict) -> Optional[dict]:
+        if not data:
+            return None
+        return {k: json.loads(v) for k, v in data.items()}
+
+    def create(self, job_id: str, job: dict):
+        self._write(job_id, job)
+
+    def update(self, job_id: str, **fields):
+        self._write(job_id, fields)
+
+    def _write(self, job_id: str, fields: dict):
+        # Fields as a dict, not kwargs: job dicts carry their own "job_id" key
+        key = self._key(job_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping=self._encode(fields))
+        pipe.expire(key, self.ttl)
+        pipe.publish(self._channel(job_id), json.dumps(fields))
+        pipe.execute()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self._decode(self.client.hgetall(self._key(job_id)))
+
+    def set_upload(self, file_id: str, path: str):
+        self.client.set(f"upload:{file_id}", path, ex=self.ttl)
+
+    def get_upload(self, file_id: str) -> Optional[str]:
+        return self.client.get(f"upload:{file_id}")
+
+    async def acreate(self, job_id: str, job: dict):
+        await self._awrite(job_id, job)
+
+    async def aupdate(self, job_id: str, **fields):
+        await self._awrite(job_id, fields)
+
+    async def _awrite(self, job_id: str, fields: dict):
+        key = self._key(job_id)
+        async with self.aclient.pipeline() as pipe:
+            pipe.hset(key, mapping=self._encode(fields))
+            pipe.expire(key, self.ttl)
+            pipe.publish(self._channel(job_id), json.dumps(fields))
+            await pipe.execute()
+
+    async def aget(self, job_id: str) -> Optional[dict]:
+        return self._decode(await self.aclient.hgetall(self._key(job_id)))
+
+    async def aset_upload(self, file_id: str, path: str):
+        await self.aclient.set(f"upload:{file_id}", path, ex=self.ttl)
+
+    async def aget_upload(self, file_id: str) -> Optional[str]:
+        return await self.aclient.get(f"upload:{file_id}")
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[asyncio.Queue]:
+        queue = asyncio.Queue()
+        pubsub = self.aclient.pubsub()
+        await pubsub.subscribe(self._channel(job_id))
+
+        async def forward():
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    queue.put_nowait(json.loads(message["data"]))
+
+        reader = asyncio.create_task(forward())
+        try:
+            yield queue
+        finally:
+            reader.cancel()
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+
+class JobQueue:
+    """In-process queue of pending jobs (lost if the server restarts)."""
+
+    def __init__(self):
+        self._queue = asyncio.Queue()
+
+    async def put(self, job: tuple):
+        """Add a job to the end of the queue."""
+        await self._queue.put(job)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[tuple]:
+        """Take the next job, or None if none arrives within timeout seconds (None waits forever)."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def done(self, job: tuple):
+        """Mark a job taken with get() as finished."""
+
+    async def empty(self) -> bool:
+        return self._queue.empty()
+
+    async def heartbeat(self):
+        """Tell other schedulers this one is alive (call at least every HEARTBEAT_TTL / 2)."""
+
+    async def reclaim(self) -> List[tuple]:
+        """Remove and return the jobs held by schedulers that died mid-job."""
+        return []
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Pending jobs in a Redis list, so they survive restarts and any worker can take them.
+    
+    get() atomically moves a job to this scheduler's taken list, and done()
+    removes it. If the scheduler dies before done(), its heartbeat key
+    expires and another scheduler reclaims the job.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.scheduler_id = uuid.uuid4().hex
+        self._taken = f"queue:taken:{self.scheduler_id}"
+        self._payloads: Dict[str, str] = {}
+
+    async def put(self, job: tuple):
+        await self.client.rpush(QUEUE_KEY, json.dumps(job))
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[tuple]:
+        if timeout is None:
+            # Block in short slices rather than forever (Redis timeout 0), so a
+            # wake-up that finds no job just retries
+            payload = None
+            while payload is None:
+                payload = await self.client.blmove(QUEUE_KEY, self._taken, BLOCK_SECONDS, "LEFT", "RIGHT")
+        elif timeout < 0.001:
+            # Redis reads a blocking timeout of 0 as "forever"
+            payload = await self.client.lmove(QUEUE_KEY, self._taken, "LEFT", "RIGHT")
+        else:
+            payload = await self.client.blmove(QUEUE_KEY, self._taken, timeout, "LEFT", "RIGHT")
+        if payload is None:
+            return None
+        job = tuple(json.loads(payload))
+        self._payloads[job[0]] = payload
+        return job
+
+    async def done(self, job: tuple):
+        await self.client.lrem(self._taken, 1, self._payloads.pop(job[0]))
+
+    async def empty(self) -> bool:
+        return await self.client.llen(QUEUE_KEY) == 0
+
+    async def heartbeat(self):
+        await self.client.set(f"scheduler:{self.scheduler_id}", 1, ex=HEARTBEAT_TTL)
+
+    async def reclaim(self) -> List[tuple]:
+        jobs = []
+        async for key in self.client.scan_iter(match="queue:taken:*"):
+            scheduler_id = key.rsplit(":", 1)[1]
+            if scheduler_id == self.scheduler_id or await self.client.exists(f"scheduler:{scheduler_id}"):
+                continue
+            # LPOP is atomic, so two schedulers reclaiming the same list never share a job
+            while (payload := await self.client.lpop(key)) is not None:
+                jobs.append(tuple(json.loads(payload)))
+        return jobs
+
+
+def create_job_store() -> JobStore:
+    """Redis store when ONEWORD_REDIS_URL is set, in-process store otherwise."""
+    if REDIS_URL:
+        if redis is None:
+            raise ImportError("ONEWORD_REDIS_URL is set but redis is not installed. Run: pip install redis")
+        return RedisJobStore(REDIS_URL)
+    return JobStore()
+
+
+def create_job_queue(store: JobStore) -> JobQueue:
+    """Pending-job queue matching the store: Redis-backed when the store is."""
+    if isinstance(store, RedisJobStore):
+        return RedisJobQueue(store.aclient)
+    return JobQueue()
@@ -0,0 +1,67 @@
+"""
+Celery worker for transcription jobs.
+When ONEWORD_BROKER_URL is set, the API enqueues jobs here instead of running
+them in its own process. Start one worker per GPU (or CPU box) with:
+
+    CUDA_VISIBLE_DEVICES=0 celery -A onewordai.api.worker worker --concurrency=1
+
+Workers report progress through the shared Redis job store, and must run
+from the API's working directory so they see the same uploads/ and outputs/
+(same host or a shared volume).
+"""
+import os
+import threading
+try:
+    from celery import Celery
+    from celery.signals import worker_init, worker_process_init
+except ImportError:
+    Celery = None
+
+from onewordai.api.store import REDIS_URL
+
+BROKER_URL = os.environ.get("ONEWORD_BROKER_URL")
+
+celery = None
+transcribe_job = None
+
+if BROKER_URL:
+    if Celery is None:
+        raise ImportError("ONEWORD_BROKER_URL is set but celery is not installed. Run: pip install celery[redis]")
+    if not REDIS_URL:
+        raise RuntimeError("ONEWORD_BROKER_URL requires ONEWORD_REDIS_URL so workers can report job status")
+
+    celery = Celery("onewordai", broker=BROKER_URL)
+    # One long job per worker process at a time; re-deliver if a worker dies mid-job
+    celery.conf.update(
+        task_acks_late=True,
+        task_reject_on_worker_lost=True,
+        worker_prefetch_multiplier=1
+    )
+
+    @worker_init.connect
+    def split_threads(sender=None, **kwargs):
+        """Give each pool process an equal share of the CPUs (set before any child imports torch)."""
+        # Not onewordai.core.threads: importing it here would fix the full count in every forked child
+        cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+        threads = max(1, cpus // max(1, sender.concurrency or 1))
+        os.environ.setdefault("ONEWORD_THREADS", str(threads))
+
+    @worker_process_init.connect
+    def prewarm_worker(**kwargs):
+        """Start loading the default model in each worker process before its first job."""
+        from onewordai.api.main import PREWARM_MODEL, prewarm_task
+        # In a thread: the pool kills a child that doesn't report up within
+        # worker_proc_alive_timeout (4 s) of this signal, far less than a model load.
+        # A job arriving meanwhile waits on model_lock, which prewarm_task holds.
+        if PREWARM_MODEL:
+            threading.Thread(target=prewarm_task, args=(PREWARM_MODEL,), daemon=True).start()
+
+    @celery.task(name="onewordai.transcribe")
+    def transcribe_job(job_id, input_path, model, language, mode, quality="fast"):
+        """Run a queued job unless it was cancelled or expired while it waited."""
+        from onewordai.api.main import jobs, process_video_task, JobStatus
+
+        queued = jobs.get(job_id)
+        if queued is None or queued["status"] == JobStatus.CANCELLED:
+            return
+        process_video_task(job_id, input_path, model, language, mode, quality)
@@ -2,16 +2,16 @@
 CLI interface for OneWord AI Subtitle Generator.
 """
 import argparse
+import functools
+import os
 import subprocess
 import sys
 from pathlib import Path
-from pathlib import Path
-
-
-
 
 
-def main():
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once and reuse it for every main() call."""
     parser = argparse.ArgumentParser(
         description="OneWord AI - Generate cinematic one-word subtitles using Whisper"
     )
@@ -38,12 +38,33 @@ def main():
         choices=["oneword", "twoword", "phrase"],
         help="Subtitle mode: oneword (default), twoword (punch effect), phrase (full segment)"
     )
+    parser.add_argument(
+        "-q", "--quality",
+        default="fast",
+        choices=["fast", "accurate"],
+        help="Decoding: fast (greedy, default) or accurate (beam search, ~2x slower)"
+    )
+    parser.add_argument(
+        "-t", "--threads",
+        type=int,
+        default=None,
+        help="CPU threads for transcription (default: number of performance cores)"
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for audio longer than 5 minutes, each with its own model (default: 1)"
+    )
     parser.add_argument(
         "-o", "--output",
         help="Output SRT file path (optional, auto-generated if not specified)"
     )
-    
-    args = parser.parse_args()
+    return parser
+
+
+def main(argv=None):
+    args = _build_parser().parse_args(argv)
     
     # Validate input file
     input_path = Path(args.input)
@@ -51,6 +72,10 @@ def main():
         print(f"❌ Error: Input file '{args.input}' not found.")
         return 1
     
+    # Thread count is read when the engine is first imported
+    if args.threads:
+        os.environ["ONEWORD_THREADS"] = str(args.threads)
+    
     # Create generator
     from .core.engine import SubtitleGenerator
     generator = SubtitleGenerator(model_name=args.model)
@@ -61,7 +86,9 @@ def main():
             input_path=str(input_path),
             output_path=args.output,
             language=args.language,
-            mode=args.mode
+            mode=args.mode,
+            quality=args.quality,
+            workers=args.workers
         )
         print(f"\n🎉 Done! SRT file: {output_file}")
         return 0
@@ -1,7 +1,14 @@
 """Core subtitle generation engine."""
-try:
-    from .engine import SubtitleGenerator
-except ImportError:
-    SubtitleGenerator = None
-
 __all__ = ["SubtitleGenerator"]
+
+
+def __getattr__(name):
+    # Import the engine (torch, whisper) on first use, not when a light
+    # submodule such as core.srt or core.threads is imported
+    if name == "SubtitleGenerator":
+        try:
+            from .engine import SubtitleGenerator
+        except ImportError:
+            SubtitleGenerator = None
+        return SubtitleGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
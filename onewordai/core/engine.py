@@ -2,117 +2,491 @@
 Core subtitle generation engine using Whisper.
 Supports multiple subtitle modes and language detection.
 """
-import datetime
+import functools
+import gc
+import importlib.util
+import io
+import os
+import sys
+import threading
 from pathlib import Path
-try:
-    import whisper
-    import torch
-    from whisper.audio import load_audio
-except ImportError:
-    whisper = None
-    torch = None
-    load_audio = None
-from typing import Optional, Literal
+from types import SimpleNamespace
+from typing import Optional, Literal, Dict, ClassVar
+
+# torch, whisper and transformers are imported where they are first needed,
+# so the CLI's --help and argument errors don't pay for loading them
+from . import threads
+from .srt import build_srt, CUE_BUILDERS
 
 SubtitleMode = Literal["oneword", "twoword", "phrase"]
+QualityMode = Literal["fast", "accurate"]
+
+# Decoding presets: "fast" is greedy without temperature fallback (about half the
+# decoder work, same word timestamps), "accurate" is 5-beam search with fallback
+QUALITY_PRESETS = {
+    "fast": {"beam_size": 1, "best_of": 1, "temperature": 0.0, "condition_on_previous_text": False},
+    "accurate": {"beam_size": 5, "best_of": 5},
+}
+
+# Transcription backend for OpenAI model names: "openai" (PyTorch), "faster" (CTranslate2),
+# "openvino" (OpenVINO GenAI), or "auto" - an exported OpenVINO model on machines
+# without CUDA, else faster-whisper when it is installed, else OpenAI Whisper
+BACKEND = os.environ.get("ONEWORD_BACKEND", "auto").lower()
+AUTO_BACKEND = BACKEND == "auto"
+if AUTO_BACKEND:
+    BACKEND = "faster" if importlib.util.find_spec("faster_whisper") else "openai"
+
+# Backends whose transcribe() returns (segment generator, info) like FasterWhisperEngine
+SEGMENT_BACKENDS = ("faster", "openvino")
+
+# faster-whisper batch size (0 = auto: 8 on GPU, 1 on CPU)
+BATCH_SIZE = int(os.environ.get("ONEWORD_BATCH_SIZE", "0"))
+
+# Hugging Face pipeline batch size in 30s windows (0 = auto: 16 on GPU, 4 on CPU)
+HF_BATCH_SIZE = int(os.environ.get("ONEWORD_HF_BATCH_SIZE", "0"))
+
+# Shortest audio (seconds) worth splitting across worker processes
+PARALLEL_MIN_SECONDS = 300
+
+# torch.compile the Whisper encoder on CUDA (opt-in: set ONEWORD_COMPILE=1)
+COMPILE = os.environ.get("ONEWORD_COMPILE", "0") == "1"
+
+
+class _CallbackProgress:
+    """Minimal tqdm stand-in that reports percent complete to a callback."""
+
+    def __init__(self, callback, total=None, **kwargs):
+        self.callback = callback
+        self.total = total
+        self.n = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def update(self, n=1):
+        self.n += n
+        if self.total:
+            self.callback(min(100, self.n / self.total * 100))
+
+
+def _cuda_available() -> bool:
+    """True when torch is installed and can see a CUDA GPU."""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def release_gpu_cache():
+    """Return cached CUDA blocks to the driver. Call when idle, never per file."""
+    # Nothing can be cached if no model has imported torch yet
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def _compile_model(model):
+    """
+    Compile the encoder with reduce-overhead mode (CUDA graphs).
+    
+    Only the encoder: it always sees one fixed-shape 30 s mel window. The
+    decoder's kv-cache grows every token and carries the kv-cache and
+    word-timestamp alignment hooks, so CUDA graphs would re-record per length.
+    """
+    import torch
+    if not COMPILE or not hasattr(torch, "compile") or not torch.cuda.is_available():
+        return model
+    
+    print("⚙️ Compiling Whisper encoder (compiled during warm-up)...")
+    model.encoder = torch.compile(model.encoder, mode="reduce-overhead", fullgraph=False)
+    return model
+
+
+def _download_hf_model(repo_id: str, status_callback=None) -> str:
+    """
+    Download a Hugging Face model snapshot and return its local path.
+    
+    Only configs, tokenizer files and one weight format (safetensors when the
+    repo has it) are fetched. Falls back to the local cache when offline.
+    """
+    from huggingface_hub import HfApi, snapshot_download
+    from tqdm.auto import tqdm as tqdm_auto
+    
+    try:
+        files = HfApi().list_repo_files(repo_id)
+    except Exception:
+        # Offline or hub unreachable: use whatever is already cached
+        return snapshot_download(repo_id, local_files_only=True)
+    
+    weights = "*.safetensors" if any(f.endswith(".safetensors") for f in files) else "*.bin"
+    # Newer huggingface_hub also drives byte-count bars; prefer those over the file count
+    reported_bytes = []
+    
+    class DownloadProgress(tqdm_auto):
+        """Console bar that also reports each update to the status callback."""
+        
+        def update(self, n=1):
+            displayed = super().update(n)
+            # tqdm only redraws every mininterval; report at the same pace
+            if displayed and status_callback and self.total:
+                rate = self.format_dict.get('rate', 0) or 0
+                elapsed = self.format_interval(self.format_dict.get('elapsed', 0) or 0)
+                remaining = self.format_interval((self.total - self.n) / rate) if rate > 0 else "??:??"
+                
+                if self.unit == "B":
+                    reported_bytes.append(True)
+                    # Format like: "68.5M/6.17G [01:29<2:06:23, 805kB/s]"
+                    done = self.format_sizeof(self.n, 'B', 1024)
+                    total = self.format_sizeof(self.total, 'B', 1024)
+                    speed = self.format_sizeof(rate, 'B/s', 1024) if rate else "0B/s"
+                    status_callback(f"📦 Downloading: {done}/{total} [{elapsed}<{remaining}, {speed}]")
+                elif not reported_bytes:
+                    status_callback(f"📦 Downloading: {self.n}/{self.total} files [{elapsed}<{remaining}]")
+            return displayed
+    
+    return snapshot_download(
+        repo_id,
+        allow_patterns=["*.json", "*.txt", "*.model", "*.tiktoken", weights],
+        tqdm_class=DownloadProgress
+    )
 
 
 class SubtitleGenerator:
     """Generate SRT subtitles from video/audio using Whisper."""
     
-    def __init__(self, model_name: str = "medium"):
+    # Loaded models shared by every instance: model_name -> (model, model_type)
+    _MODEL_CACHE: ClassVar[Dict[str, tuple]] = {}
+    _CACHE_LOCK: ClassVar[threading.Lock] = threading.Lock()
+    # One lock per model name, held while that model loads
+    _LOAD_LOCKS: ClassVar[Dict[str, threading.Lock]] = {}
+    
+    def __init__(self, model_name: str = "medium", verbose: bool = True):
         """
         Initialize the subtitle generator.
         
         Args:
             model_name: Whisper model to use (tiny, base, small, medium, large)
+            verbose: Print per-job messages and Whisper's console progress bar
         """
         self.model_name = model_name
+        self.verbose = verbose
         self.model = None
-        # Prevent CPU overload
-        torch.set_num_threads(4)
+        # Duration (seconds) of the last decoded input
+        self.audio_duration = None
+        # Language reported by the last faster-whisper transcription
+        self.detected_language = None
+        # Pinned staging buffers for audio uploads (created on first CUDA transcription)
+        self.audio_stager = None
+    
+    @classmethod
+    def clear_cache(cls):
+        """Drop all cached models and free their memory."""
+        with cls._CACHE_LOCK:
+            cls._MODEL_CACHE.clear()
+        gc.collect()
+        release_gpu_cache()
     
     def load_model(self, status_callback=None):
-        """Load the Whisper model (OpenAI or Hugging Face)."""
-        if self.model is None:
-            if "Oriserve" in self.model_name or "/" in self.model_name:
-                print(f"📦 Loading Hugging Face model: {self.model_name}...")
-                from transformers import pipeline
-                import torch
-                import os
-                from tqdm.auto import tqdm as tqdm_auto
-                
-                # Set up custom tqdm callback to capture download progress
-                original_tqdm = tqdm_auto
-                
-                class ProgressCapture(original_tqdm):
-                    def __init__(self, *args, **kwargs):
-                        super().__init__(*args, **kwargs)
-                        
-                    def display(self, msg=None, pos=None, *args, **kwargs):
-                        super().display(msg, pos, *args, **kwargs)
-                        # Capture progress for status callback
-                        if status_callback and self.total:
-                            downloaded = self.n
-                            total = self.total
-                            rate = self.format_dict.get('rate', 0) or 0
-                            elapsed = self.format_dict.get('elapsed', 0) or 0
-                            
-                            # Format like: "68.5M/6.17G [01:29<2:06:23, 805kB/s]"
-                            downloaded_str = self.format_sizeof(downloaded, 'B', 1024)
-                            total_str = self.format_sizeof(total, 'B', 1024)
-                            rate_str = self.format_sizeof(rate, 'B/s', 1024) if rate else "0B/s"
-                            
-                            elapsed_str = self.format_interval(elapsed)
-                            
-                            # Calculate remaining time
-                            if rate > 0:
-                                remaining = (total - downloaded) / rate
-                                remaining_str = self.format_interval(remaining)
-                            else:
-                                remaining_str = "??:??"
-                            
-                            progress_msg = f"📦 Downloading: {downloaded_str}/{total_str} [{elapsed_str}<{remaining_str}, {rate_str}]"
-                            status_callback(progress_msg)
-                
-                # Monkey-patch tqdm for this model load
-                import tqdm.auto
-                original_tqdm_ref = tqdm.auto.tqdm
-                tqdm.auto.tqdm = ProgressCapture
-                
-                try:
-                    if status_callback:
-                        status_callback("📦 Checking model files... (Download starting if needed)")
-                    
-                    device = "cuda" if torch.cuda.is_available() else "cpu"
-                    self.model = pipeline(
-                        "automatic-speech-recognition",
-                        model=self.model_name,
-                        device=device
-                    )
-                    self.model_type = "huggingface"
-                finally:
-                    # Restore original tqdm
-                    tqdm.auto.tqdm = original_tqdm_ref
-                    
-            else:
-                if status_callback:
-                    size_estimate = "~1.5GB" if "medium" in self.model_name else "~3GB"
-                    status_callback(f"📦 Downloading Model ({size_estimate}, 5-15 min) - One-time only!")
-                    
-                print(f"📦 Loading OpenAI Whisper model: {self.model_name}...")
-                self.model = whisper.load_model(self.model_name)
-                self.model_type = "openai"
-                
+        """Load the Whisper model (OpenAI or Hugging Face), reusing cached weights."""
+        if self.model is not None:
+            return
+        
+        # Reuse weights already loaded by another generator (e.g. a previous web job).
+        # _CACHE_LOCK only guards the dict; loads (downloads included) hold a per-model
+        # lock, so loading one model never blocks cache hits or loads of another
+        with SubtitleGenerator._CACHE_LOCK:
+            cached = SubtitleGenerator._MODEL_CACHE.get(self.model_name)
+            load_lock = SubtitleGenerator._LOAD_LOCKS.setdefault(self.model_name, threading.Lock())
+        
+        if cached is None:
+            with load_lock:
+                # Another thread may have finished loading it while we waited
+                with SubtitleGenerator._CACHE_LOCK:
+                    cached = SubtitleGenerator._MODEL_CACHE.get(self.model_name)
+                if cached is None:
+                    self._load_backend(status_callback)
+                    cached = (self.model, self.model_type)
+                    with SubtitleGenerator._CACHE_LOCK:
+                        SubtitleGenerator._MODEL_CACHE[self.model_name] = cached
+        self.model, self.model_type = cached
+            
+        if status_callback:
+            status_callback("✅ Model Ready! Transcribing...")
+
+    def _load_backend(self, status_callback=None):
+        """Load this generator's model into self.model with the backend it needs."""
+        if "Oriserve" in self.model_name or "/" in self.model_name:
+            print(f"📦 Loading Hugging Face model: {self.model_name}...")
+            from transformers import pipeline
+            import torch
+            threads.configure_torch()
+
             if status_callback:
-                status_callback("✅ Model Ready! Transcribing...")
+                status_callback("📦 Checking model files... (Download starting if needed)")
+
+            # Fetch weights up front so download progress reaches the status callback;
+            # the pipeline then loads from the local snapshot without hub requests
+            model_path = _download_hf_model(self.model_name, status_callback)
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+
+            # Half precision on GPU: BF16 on Ampere+ (same range as FP32), FP16 before
+            torch_dtype = torch.float32
+            if device == "cuda":
+                torch_dtype = torch.bfloat16 if torch.cuda.get_device_capability()[0] >= 8 else torch.float16
+
+            # Word timestamps need the cross-attention weights (output_attentions=True):
+            # FlashAttention-2 rejects that and SDPA falls back to eager anyway
+            attn_implementation = "eager"
+
+            # Split audio into 30s windows and push several through each forward pass
+            self.model = pipeline(
+                "automatic-speech-recognition",
+                model=model_path,
+                device=device,
+                chunk_length_s=30,
+                batch_size=HF_BATCH_SIZE or (16 if device == "cuda" else 4),
+                torch_dtype=torch_dtype,
+                model_kwargs={"attn_implementation": attn_implementation}
+            )
+            self.model_type = "huggingface"
+
+        elif BACKEND == "openvino" or (AUTO_BACKEND and self._openvino_preferred()):
+            print(f"📦 Loading OpenVINO model: {self.model_name}...")
+            from .engine_ov import OpenVINOWhisperEngine
+            self.model = OpenVINOWhisperEngine(self.model_name)
+            self.model_type = "openvino"
+
+        elif BACKEND == "faster":
+            print(f"📦 Loading faster-whisper model: {self.model_name}...")
+            from .engine_ct2 import FasterWhisperEngine
+            self.model = FasterWhisperEngine(self.model_name, batch_size=BATCH_SIZE or None)
+            self.model_type = "faster"
+
+        else:
+            if status_callback:
+                size_estimate = "~1.5GB" if "medium" in self.model_name else "~3GB"
+                status_callback(f"📦 Downloading Model ({size_estimate}, 5-15 min) - One-time only!")
+
+            print(f"📦 Loading OpenAI Whisper model: {self.model_name}...")
+            import whisper
+            import torch
+            threads.configure_torch()
+
+            # Place the model explicitly so a missed CUDA check can't leave it on CPU in FP32
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.model = _compile_model(whisper.load_model(self.model_name, device=device))
+            self.model_type = "openai"
+            if device == "cuda":
+                self._warm_up()
+
+    def _warm_up(self):
+        """
+        Decode one second of silence on the freshly loaded OpenAI model.
+        
+        Pays for cuDNN autotuning, CUDA context setup and torch.compile's
+        graph capture at load time instead of in the first user's job.
+        """
+        import numpy as np
+        print("🔥 Warming up model...")
+        self.model.transcribe(
+            np.zeros(16000, dtype=np.float32),
+            word_timestamps=True,
+            verbose=None,
+            fp16=True,
+            **QUALITY_PRESETS["fast"]
+        )
+
+    def _openvino_preferred(self) -> bool:
+        """Use OpenVINO when auto-selecting on a machine with no CUDA GPU and an exported model."""
+        from .engine_ov import is_available
+        if _cuda_available():
+            return False
+        return self.model_name in ("medium", "large") and is_available(self.model_name)
+
+    def _log(self, message: str):
+        """Print a per-job message unless the generator is quiet."""
+        if self.verbose:
+            print(message)
+
+    def _read_audio(self, file_path: str, audio_cache: Optional[str] = None):
+        """
+        Decode the input once to 16 kHz mono PCM (duration cached on self.audio_duration).
+        
+        With audio_cache, the decoded float32 samples are kept in that file and
+        read back directly on later calls, skipping ffmpeg.
+        """
+        import numpy as np
+        
+        cache = Path(audio_cache) if audio_cache else None
+        if cache is not None and cache.exists():
+            self._log(f"🎵 Reading cached audio...")
+            audio = np.fromfile(cache, dtype=np.float32)
+        else:
+            self._log(f"🎵 Reading audio...")
+            try:
+                from whisper.audio import load_audio
+                audio = load_audio(str(file_path))
+            except ImportError:
+                # faster-whisper-only install: decode with its PyAV reader instead
+                from .engine_ct2 import decode_audio
+                audio = decode_audio(str(file_path), sampling_rate=16000)
+            if cache is not None:
+                # Write then rename, so a concurrent job never reads a partial cache
+                partial = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+                audio.astype(np.float32, copy=False).tofile(partial)
+                os.replace(partial, cache)
+        self.audio_duration = len(audio) / 16000
+        self._log(f"⏱ Audio Duration: {self.audio_duration:.2f} seconds")
+        return audio, self.audio_duration
+
+    @staticmethod
+    def _hf_to_openai(out: dict) -> dict:
+        """
+        Normalize Hugging Face pipeline output to the OpenAI Whisper result structure.
+        
+        Transformers returns {'text': '...', 'chunks': [{'text': ' word', 'timestamp': (start, end)}, ...]};
+        all words go into a single segment.
+        """
+        words = [
+            {"word": c["text"].strip(), "start": c["timestamp"][0], "end": c["timestamp"][1]}
+            for c in out.get("chunks", []) if c.get("timestamp")
+        ]
+        segment = {
+            "text": out["text"],
+            "start": words[0]["start"] if words else 0,
+            "end": words[-1]["end"] if words else 0,
+            "words": words
+        }
+        return {
+            "text": out["text"],
+            "segments": [segment]
+        }
+
+    def _run_model(self, audio, language: Optional[str], decode_options: dict) -> dict:
+        """Run an OpenAI or Hugging Face model to completion and return a Whisper-style result."""
+        if self.model_type == "huggingface":
+            # Hugging Face Pipeline
+            generate_kwargs = {"language": language} if language else {}
+            generate_kwargs["num_beams"] = decode_options["beam_size"]
+            # For Hindi2Hinglish, language might need to be 'hi' or auto
+            
+            # Hand over the already decoded PCM so the pipeline skips its own ffmpeg pass
+            out = self.model(
+                {"raw": audio, "sampling_rate": 16000},
+                return_timestamps="word",
+                generate_kwargs=generate_kwargs
+            )
+            
+            return self._hf_to_openai(out)
+        
+        # OpenAI Whisper
+        transcribe_options = {
+            "word_timestamps": True,
+            # False shows whisper's console progress bar, None prints nothing
+            "verbose": False if self.verbose else None,
+            "fp16": self.model.device.type == "cuda",
+            **decode_options
+        }
+        if language:
+            transcribe_options["language"] = language
+        return self.model.transcribe(self._audio_tensor(audio), **transcribe_options)
+
+    def _run_with_progress(
+        self,
+        audio,
+        language: Optional[str],
+        decode_options: dict,
+        progress_callback=None
+    ) -> dict:
+        """Run _run_model, forwarding OpenAI Whisper's decode progress to the callback."""
+        if not progress_callback:
+            # Sync execution (CLI usage mostly)
+            return self._run_model(audio, language, decode_options)
+        
+        if self.model_type != "openai":
+            # The HF pipeline has no progress hook; report completion only
+            result = self._run_model(audio, language, decode_options)
+            progress_callback(100)
+            return result
+        
+        # whisper.transcribe advances a tqdm bar by mel frames as each window is
+        # decoded; swap in a shim that reports those frames instead of printing
+        import whisper.transcribe as whisper_transcribe
+        original_tqdm = whisper_transcribe.tqdm
+        whisper_transcribe.tqdm = SimpleNamespace(
+            tqdm=functools.partial(_CallbackProgress, progress_callback)
+        )
+        try:
+            result = self._run_model(audio, language, decode_options)
+        finally:
+            whisper_transcribe.tqdm = original_tqdm
+        
+        progress_callback(100)
+        return result
+
+    def iter_segments(
+        self,
+        file_path: str,
+        language: Optional[str] = None,
+        progress_callback=None,
+        status_callback=None,
+        quality: QualityMode = "fast",
+        workers: int = 1,
+        audio_cache: Optional[str] = None
+    ):
+        """
+        Transcribe audio/video file, yielding Whisper-style segment dicts.
+        
+        faster-whisper segments are yielded as they are decoded; the OpenAI
+        and Hugging Face backends yield once their transcription finishes.
+        Takes the same arguments as transcribe(), plus workers for
+        transcribe_parallel() and audio_cache for the decoded-PCM cache file.
+        """
+        if workers > 1:
+            # Worker processes load their own models; skip loading one here
+            audio, _ = self._read_audio(file_path, audio_cache)
+            result = self.transcribe_parallel(
+                audio, workers, language, quality, progress_callback, status_callback
+            )
+            yield from result["segments"]
+            return
+        
+        decode_options = QUALITY_PRESETS[quality]
+        self.load_model(status_callback)
+        audio, audio_duration = self._read_audio(file_path, audio_cache)
+        
+        self._log(f"\n🧠 Transcribing started ({self.model_type})...\n")
+        
+        # faster-whisper yields segments lazily, so progress is real (no thread needed)
+        if self.model_type in SEGMENT_BACKENDS:
+            segments, info = self.model.transcribe(audio, language=language, **decode_options)
+            self.detected_language = info.language
+            for segment in segments:
+                yield segment
+                if progress_callback and audio_duration:
+                    progress_callback(min(100, segment["end"] / audio_duration * 100))
+            
+            if progress_callback:
+                progress_callback(100)
+            return
+        
+        result = self._run_with_progress(
+            audio, language, decode_options, progress_callback
+        )
+        yield from result["segments"]
 
     def transcribe(
         self, 
         file_path: str, 
         language: Optional[str] = None,
         progress_callback=None,
-        status_callback=None
+        status_callback=None,
+        quality: QualityMode = "fast"
     ) -> dict:
         """
         Transcribe audio/video file.
@@ -121,134 +495,116 @@ class SubtitleGenerator:
             language: Language code (hi, en, ur, es) or None for auto-detect
             progress_callback: Optional callback function for progress updates
             status_callback: Optional callback for status text updates
+            quality: Decoding preset - fast (greedy) or accurate (beam search)
         """
+        decode_options = QUALITY_PRESETS[quality]
         self.load_model(status_callback)
         
-        print(f"🎵 Reading audio...")
-        audio = load_audio(str(file_path))
-        audio_duration = len(audio) / 16000
-        print(f"⏱ Audio Duration: {audio_duration:.2f} seconds")
+        if self.model_type in SEGMENT_BACKENDS:
+            collected = list(self.iter_segments(
+                file_path, language, progress_callback, status_callback, quality
+            ))
+            return {
+                "text": "".join(s["text"] for s in collected),
+                "segments": collected,
+                "language": self.detected_language
+            }
         
-        print(f"\n🧠 Transcribing started ({self.model_type})...\n")
+        audio, _ = self._read_audio(file_path)
+        self._log(f"\n🧠 Transcribing started ({self.model_type})...\n")
+        return self._run_with_progress(
+            audio, language, decode_options, progress_callback
+        )
+
+    def transcribe_audio(
+        self,
+        audio,
+        language: Optional[str] = None,
+        quality: QualityMode = "fast",
+        status_callback=None
+    ) -> dict:
+        """Transcribe already decoded 16 kHz PCM, without progress reporting."""
+        decode_options = QUALITY_PRESETS[quality]
+        self.load_model(status_callback)
         
-        # Threaded transcription to support progress callback
-        if progress_callback:
-            import threading
-            import time
-            
-            result_container = {}
-            exception_container = {}
-            
-            # Transcription function wrapper
-            def transcribe_task():
-                try:
-                    if self.model_type == "huggingface":
-                        # Hugging Face Pipeline
-                        generate_kwargs = {"language": language} if language else {}
-                        # For Hindi2Hinglish, language might need to be 'hi' or auto
-                        
-                        out = self.model(
-                            str(file_path), 
-                            return_timestamps="word",
-                            generate_kwargs=generate_kwargs
-                        )
-                        
-                        # Normalize output to match OpenAI structure
-                        # Transformers returns: {'text': '...', 'chunks': [{'text': ' word', 'timestamp': (start, end)}, ...]}
-                        chunks = out.get("chunks", [])
-                        words = []
-                        for chunk in chunks:
-                             # Timestamp is a tuple (start, end)
-                             ts = chunk.get("timestamp")
-                             if ts:
-                                 start, end = ts
-                                 words.append({
-                                     "word": chunk["text"].strip(),
-                                     "start": start,
-                                     "end": end
-                                 })
-                        
-                        # Create a single segment with all words
-                        segment = {
-                            "text": out["text"],
-                            "start": words[0]["start"] if words else 0,
-                            "end": words[-1]["end"] if words else 0,
-                            "words": words
-                        }
-                        
-                        result_container['result'] = {
-                            "text": out["text"],
-                            "segments": [segment]
-                        }
-                        
-                    else:
-                        # OpenAI Whisper
-                        transcribe_options = {"word_timestamps": True, "verbose": False}
-                        if language:
-                            transcribe_options["language"] = language
-                            
-                        result_container['result'] = self.model.transcribe(str(file_path), **transcribe_options)
-                        
-                except Exception as e:
-                    exception_container['error'] = e
-            
-            # Start background thread
-            thread = threading.Thread(target=transcribe_task)
-            thread.start()
-            
-            # Simulate progress
-            # Estimate speed: HF models can be slower or faster depending on implementation
-            # Generic estimate logic
-            speed_mult = 4.0 if self.model_type == "huggingface" else 1.5
-            if self.model_name in ['tiny', 'base']: speed_mult = 1.0
-            
-            estimated_time = audio_duration * speed_mult
-            
-            start_time = time.time()
-            while thread.is_alive():
-                elapsed = time.time() - start_time
-                progress = min(95, (elapsed / estimated_time) * 100)
-                progress_callback(progress)
-                time.sleep(0.5)
-            
-            thread.join()
-            
-            if 'error' in exception_container:
-                raise exception_container['error']
-            
-            progress_callback(100)
-            return result_container['result']
-            
-        else:
-            # Sync execution (CLI usage mostly)
-            if self.model_type == "huggingface":
-                out = self.model(str(file_path), return_timestamps="word")
-                chunks = out.get("chunks", [])
-                words = []
-                for chunk in chunks:
-                        ts = chunk.get("timestamp")
-                        if ts:
-                            words.append({
-                                "word": chunk["text"].strip(),
-                                "start": ts[0],
-                                "end": ts[1]
-                            })
-                return {
-                    "text": out["text"],
-                    "segments": [{
-                        "text": out["text"],
-                        "start": words[0]["start"] if words else 0,
-                        "end": words[-1]["end"] if words else 0,
-                        "words": words
-                    }]
-                }
-            else:
-                transcribe_options = {"word_timestamps": True, "verbose": False}
-                if language:
-                    transcribe_options["language"] = language
-                return self.model.transcribe(str(file_path), **transcribe_options)
-
-    # ... (format_timestamp and generate_srt remain unchanged) ...
+        if self.model_type in SEGMENT_BACKENDS:
+            segments, info = self.model.transcribe(audio, language=language, **decode_options)
+            segments = list(segments)
+            return {
+                "text": "".join(s["text"] for s in segments),
+                "segments": segments,
+                "language": info.language
+            }
+        return self._run_model(audio, language, decode_options)
+
+    def transcribe_parallel(
+        self,
+        audio,
+        n_workers: int,
+        language: Optional[str] = None,
+        quality: QualityMode = "fast",
+        progress_callback=None,
+        status_callback=None
+    ) -> dict:
+        """
+        Transcribe long audio by fanning chunks out to worker processes.
+        
+        The audio is cut at the quietest point near each of n_workers even
+        splits; every worker keeps its own copy of the model between calls.
+        Clips shorter than PARALLEL_MIN_SECONDS are transcribed in-process.
+        
+        Args:
+            audio: 16 kHz mono float32 PCM
+            n_workers: Number of worker processes
+            language: Language code or None for auto-detect
+            quality: Decoding preset - fast (greedy) or accurate (beam search)
+            progress_callback: Optional callback, called as each chunk finishes
+            status_callback: Optional callback for status text updates
+        """
+        from concurrent.futures import as_completed
+        from .parallel import SAMPLE_RATE, find_silence_cuts, get_pool, shift_result, _transcribe_chunk
+        
+        cuts = find_silence_cuts(audio, n_workers) if len(audio) >= PARALLEL_MIN_SECONDS * SAMPLE_RATE else []
+        if not cuts:
+            result = self.transcribe_audio(audio, language, quality, status_callback)
+            if progress_callback:
+                progress_callback(100)
+            return result
+        
+        bounds = [0, *cuts, len(audio)]
+        self._log(f"\n🧠 Transcribing {len(bounds) - 1} chunks on {n_workers} workers...\n")
+        if status_callback:
+            status_callback(f"⚙️ Starting {n_workers} transcription workers...")
+        
+        pool = get_pool(self.model_name, n_workers)
+        futures = [
+            pool.submit(_transcribe_chunk, start / SAMPLE_RATE, audio[start:end], language, quality)
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        
+        results = []
+        for done, future in enumerate(as_completed(futures), 1):
+            results.append(future.result())
+            if progress_callback:
+                progress_callback(done / len(futures) * 100)
+        
+        # Put chunks back in order and move their timestamps to file time
+        results.sort(key=lambda r: r[0])
+        segments = [seg for offset, result in results for seg in shift_result(result, offset)["segments"]]
+        return {
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments,
+            "language": results[0][1].get("language")
+        }
+
+    def _audio_tensor(self, audio):
+        """Decoded PCM as a tensor on the OpenAI model's device."""
+        from .mel import audio_on_device, AudioStager
+        if self.model.device.type == "cuda":
+            if self.audio_stager is None:
+                self.audio_stager = AudioStager(self.model.device)
+            return self.audio_stager.stage(audio)
+        return audio_on_device(audio, self.model.device)
 
     def process(
         self,
@@ -257,11 +613,17 @@ class SubtitleGenerator:
         language: Optional[str] = None,
         mode: SubtitleMode = "oneword",
         progress_callback=None,
-        status_callback=None
+        status_callback=None,
+        quality: QualityMode = "fast",
+        workers: int = 1,
+        audio_cache: Optional[str] = None
     ) -> str:
         """
         Full processing pipeline: transcribe and generate SRT.
         
+        Subtitles are written segment by segment as transcription produces
+        them, so the full word list is never held in memory.
+        
         Args:
             input_path: Path to input video/audio
             output_path: Path for output SRT (auto-generated if None)
@@ -269,6 +631,10 @@ class SubtitleGenerator:
             mode: Subtitle mode
             progress_callback: Optional progress callback
             status_callback: Optional callback for status text updates
+            quality: Decoding preset - fast (greedy) or accurate (beam search)
+            workers: Worker processes for long audio (see transcribe_parallel)
+            audio_cache: Optional file holding the decoded 16 kHz float32 audio
+                (created on first use, reused when the same input is processed again)
             
         Returns:
             Path to generated SRT file
@@ -281,24 +647,51 @@ class SubtitleGenerator:
         if output_path is None:
             output_path = video_path.parent / f"{video_path.stem}_{mode}_subs.srt"
         
-        # Transcribe
-        result = self.transcribe(input_path, language, progress_callback, status_callback)
+        segments = self.iter_segments(
+            input_path, language, progress_callback, status_callback, quality, workers, audio_cache
+        )
         
-        # Generate SRT
-        self.generate_srt(result, str(output_path), mode)
+        # Transcribe and write subtitles as segments arrive (1 MB buffer: few write syscalls).
+        # They go to a temporary file that replaces output_path only once transcription
+        # succeeds, so a failed run never leaves an empty or partial SRT behind
+        cues = CUE_BUILDERS[mode]
+        partial_path = Path(f"{output_path}.partial")
+        try:
+            with open(partial_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                counter = [1]
+                for segment in segments:
+                    self._write_segment(f, segment, cues, counter)
+            os.replace(partial_path, output_path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
         
+        self._log(f"✅ Success! Subtitles saved to: {output_path}")
         return str(output_path)
     
     @staticmethod
     def format_timestamp(seconds: float) -> str:
         """Convert seconds to SRT timestamp format."""
-        td = datetime.timedelta(seconds=seconds)
-        total_seconds = int(td.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        secs = total_seconds % 60
-        millis = int(td.microseconds / 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+        # Round to whole microseconds first (as timedelta did), then truncate to ms
+        ms = round(seconds * 1_000_000) // 1000
+        return f"{ms // 3_600_000:02d}:{ms // 60_000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+    
+    @staticmethod
+    def _write_segment(f, segment: dict, cues, counter: list):
+        """
+        Write the SRT entries for one segment.
+        
+        Args:
+            f: Open text file to write to
+            segment: Whisper-style segment dict
+            cues: The mode's cue builder from CUE_BUILDERS
+            counter: One-element list holding the next entry number (updated in place)
+        """
+        # Cues come back as parallel arrays, so all timestamps are formatted at once
+        starts, ends, texts = cues(segment)
+        if texts:
+            f.write(build_srt(starts, ends, texts, first=counter[0]))
+            counter[0] += len(texts)
     
     def generate_srt(
         self, 
@@ -314,65 +707,14 @@ class SubtitleGenerator:
             output_path: Path to save SRT file
             mode: Subtitle mode - oneword, twoword, or phrase
         """
-        print("✍ Writing subtitles...")
+        self._log("✍ Writing subtitles...")
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            counter = 1
-            
-            if mode == "oneword":
-                # One word per subtitle
-                for segment in result["segments"]:
-                    for word_data in segment["words"]:
-                        word = word_data["word"].strip().replace(",", "")
-                        if not word:
-                            continue
-                        
-                        start = word_data["start"]
-                        end = word_data["end"]
-                        
-                        f.write(f"{counter}\n")
-                        f.write(f"{self.format_timestamp(start)} --> {self.format_timestamp(end)}\n")
-                        f.write(f"{word}\n\n")
-                        counter += 1
-            
-            elif mode == "twoword":
-                # Two words per subtitle (punch effect)
-                for segment in result["segments"]:
-                    words = segment["words"]
-                    i = 0
-                    while i < len(words):
-                        # Get up to 2 words
-                        word_group = words[i:i+2]
-                        text = " ".join([w["word"].strip().replace(",", "") for w in word_group if w["word"].strip()])
-                        
-                        if not text:
-                            i += 2
-                            continue
-                        
-                        start = word_group[0]["start"]
-                        end = word_group[-1]["end"]
-                        
-                        f.write(f"{counter}\n")
-                        f.write(f"{self.format_timestamp(start)} --> {self.format_timestamp(end)}\n")
-                        f.write(f"{text}\n\n")
-                        counter += 1
-                        i += 2
-            
-            elif mode == "phrase":
-                # Full segment text (phrase mode)
-                for segment in result["segments"]:
-                    text = segment["text"].strip()
-                    if not text:
-                        continue
-                    
-                    start = segment["start"]
-                    end = segment["end"]
-                    
-                    f.write(f"{counter}\n")
-                    f.write(f"{self.format_timestamp(start)} --> {self.format_timestamp(end)}\n")
-                    f.write(f"{text}\n\n")
-                    counter += 1
-        
-        print(f"✅ Success! Subtitles saved to: {output_path}")
-    
-
+        # Assemble the whole document in memory, then write it in one call
+        buf = io.StringIO()
+        cues = CUE_BUILDERS[mode]
+        counter = [1]
+        for segment in result["segments"]:
+            self._write_segment(buf, segment, cues, counter)
+        Path(output_path).write_text(buf.getvalue(), encoding="utf-8")
+        
+        self._log(f"✅ Success! Subtitles saved to: {output_path}")
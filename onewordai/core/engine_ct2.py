@@ -0,0 +1,115 @@
+"""
+faster-whisper (CTranslate2) transcription backend.
+Runs Whisper with INT8 weights (FP32 activations on CPU, FP16 on GPU).
+"""
+from typing import Iterator, Optional, Tuple
+
+from .threads import NUM_THREADS
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline, decode_audio
+except ImportError:
+    WhisperModel = None
+    BatchedInferencePipeline = None
+    decode_audio = None
+
+
+def _default_device() -> str:
+    """Pick cuda when CTranslate2 can see a GPU, otherwise cpu."""
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda"
+    except Exception:
+        pass
+    return "cpu"
+
+
+def segment_to_dict(segment) -> dict:
+    """Convert a faster-whisper Segment into the OpenAI Whisper segment dict."""
+    return {
+        "text": segment.text,
+        "start": segment.start,
+        "end": segment.end,
+        "words": [
+            {"word": w.word, "start": w.start, "end": w.end}
+            for w in (segment.words or [])
+        ]
+    }
+
+
+class FasterWhisperEngine:
+    """Thin wrapper around faster_whisper.WhisperModel."""
+
+    def __init__(
+        self,
+        model_name: str = "medium",
+        device: str = "auto",
+        compute_type: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ):
+        """
+        Load a CTranslate2 Whisper model.
+
+        Args:
+            model_name: Whisper model to use (tiny, base, small, medium, large)
+            device: cpu, cuda or auto
+            compute_type: CTranslate2 compute type (default: int8 on CPU, int8_float16 on GPU)
+            batch_size: 30s windows decoded per forward pass (default: 8 on GPU, 1 on CPU)
+        """
+        if WhisperModel is None:
+            raise ImportError("faster-whisper is not installed. Run: pip install faster-whisper")
+
+        if device == "auto":
+            device = _default_device()
+        if compute_type is None:
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+        if batch_size is None:
+            batch_size = 8 if device == "cuda" else 1
+
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type
+        self.batch_size = batch_size
+        self.model = WhisperModel(
+            model_name,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=NUM_THREADS
+        )
+
+        # Batched pipeline splits the audio on VAD boundaries and decodes windows together
+        self.pipeline = None
+        if batch_size > 1:
+            self.pipeline = BatchedInferencePipeline(model=self.model)
+
+    def transcribe(
+        self,
+        audio,
+        word_timestamps: bool = True,
+        language: Optional[str] = None,
+        **options
+    ) -> Tuple[Iterator[dict], object]:
+        """
+        Transcribe a file path or 16 kHz float32 array.
+
+        Returns:
+            (segments, info) where segments is a lazy generator of segment dicts
+            ({"text", "start", "end", "words": [{"word", "start", "end"}]})
+            and info is faster-whisper's TranscriptionInfo.
+        """
+        if self.pipeline is not None:
+            options.setdefault("batch_size", self.batch_size)
+            segments, info = self.pipeline.transcribe(
+                audio,
+                word_timestamps=word_timestamps,
+                language=language,
+                **options
+            )
+        else:
+            segments, info = self.model.transcribe(
+                audio,
+                word_timestamps=word_timestamps,
+                language=language,
+                **options
+            )
+        return (segment_to_dict(s) for s in segments), info
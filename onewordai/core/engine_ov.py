@@ -0,0 +1,132 @@
+"""
+OpenVINO GenAI transcription backend.
+Runs an INT8 OpenVINO export of Whisper on Intel NPU, GPU or CPU, caching
+the compiled model between runs.
+"""
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator, List, Optional, Tuple
+try:
+    import openvino_genai
+except ImportError:
+    openvino_genai = None
+
+# Exported models live in <OV_MODEL_DIR>/whisper-<model_name>
+OV_MODEL_DIR = Path(os.environ.get("ONEWORD_OV_MODEL_DIR", Path.home() / ".cache" / "onewordai" / "openvino"))
+
+# Compiled model blobs (skips the multi-minute NPU/GPU compile after the first run)
+CACHE_DIR = Path.home() / ".cache" / "onewordai" / "ov_cache"
+
+
+def exported_model_dir(model_name: str) -> Path:
+    """Where the OpenVINO export of a Whisper model is expected."""
+    return OV_MODEL_DIR / f"whisper-{model_name}"
+
+
+def is_available(model_name: str) -> bool:
+    """True when openvino_genai is installed and the model has been exported."""
+    return openvino_genai is not None and exported_model_dir(model_name).is_dir()
+
+
+def _default_device() -> str:
+    """Fastest OpenVINO device present: NPU, then GPU, then CPU."""
+    try:
+        import openvino
+        devices = openvino.Core().available_devices
+    except Exception:
+        return "CPU"
+    for device in ("NPU", "GPU"):
+        if any(d.startswith(device) for d in devices):
+            return device
+    return "CPU"
+
+
+def _split_words(text: str, start: float, end: float) -> List[dict]:
+    """Spread a chunk's duration over its words in proportion to their length."""
+    words = text.split()
+    total = sum(len(w) for w in words)
+    out = []
+    t = start
+    for w in words:
+        step = (end - start) * len(w) / total
+        out.append({"word": " " + w, "start": t, "end": t + step})
+        t += step
+    return out
+
+
+class OpenVINOWhisperEngine:
+    """Thin wrapper around openvino_genai.WhisperPipeline."""
+
+    def __init__(self, model_name: str = "medium", device: str = "auto"):
+        """
+        Load an exported OpenVINO Whisper model.
+
+        Args:
+            model_name: Whisper model to use (medium, large)
+            device: NPU, GPU, CPU or auto
+        """
+        if openvino_genai is None:
+            raise ImportError("openvino-genai is not installed. Run: pip install openvino-genai")
+
+        model_dir = exported_model_dir(model_name)
+        if not model_dir.is_dir():
+            raise FileNotFoundError(
+                f"OpenVINO model not found at {model_dir}. Export it with: "
+                f"optimum-cli export openvino --model openai/whisper-{model_name} --weight-format int8 {model_dir}"
+            )
+
+        if device == "auto":
+            device = _default_device()
+
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.device = device
+        self.pipeline = openvino_genai.WhisperPipeline(
+            str(model_dir), device, word_timestamps=True, CACHE_DIR=str(CACHE_DIR)
+        )
+
+    def transcribe(
+        self,
+        audio,
+        word_timestamps: bool = True,
+        language: Optional[str] = None,
+        **options
+    ) -> Tuple[Iterator[dict], object]:
+        """
+        Transcribe a 16 kHz float32 array.
+
+        Returns the same (segments, info) pair as FasterWhisperEngine.transcribe.
+        Only beam_size is taken from the decoding options.
+        """
+        config = self.pipeline.get_generation_config()
+        config.task = "transcribe"
+        config.return_timestamps = True
+        config.word_timestamps = word_timestamps
+        config.num_beams = options.get("beam_size", 1)
+        if language:
+            config.language = f"<|{language}|>"
+
+        result = self.pipeline.generate(audio, config)
+        words = list(getattr(result, "words", None) or [])
+
+        def segments():
+            i = 0
+            last = len(result.chunks) - 1
+            for n, chunk in enumerate(result.chunks):
+                segment_words = []
+                # Words belong to the chunk they start in (the last chunk takes any stragglers)
+                while i < len(words) and (words[i].start_ts < chunk.end_ts or n == last):
+                    segment_words.append({"word": words[i].word, "start": words[i].start_ts, "end": words[i].end_ts})
+                    i += 1
+                if not words:
+                    # Older openvino-genai builds only return chunk timestamps
+                    segment_words = _split_words(chunk.text, chunk.start_ts, chunk.end_ts)
+                yield {
+                    "text": chunk.text,
+                    "start": chunk.start_ts,
+                    "end": chunk.end_ts,
+                    "words": segment_words
+                }
+
+        return segments(), SimpleNamespace(language=language)
@@ -0,0 +1,59 @@
+"""
+Log-mel front end placement for OpenAI Whisper.
+Whisper computes the log-mel spectrogram (STFT + mel filterbank matmul) on
+whichever device the audio tensor lives on, so decoded PCM is handed over
+as a tensor already on the model's device (for clips up to MAX_GPU_SECONDS).
+"""
+import numpy as np
+import torch
+
+SAMPLE_RATE = 16000
+
+# Longest audio whose full-file STFT runs on the GPU. Its transient memory grows
+# with length (roughly 1 GB per hour), so longer audio keeps the log-mel pass
+# on the CPU and whisper moves each 30 s mel window to the GPU instead.
+MAX_GPU_SECONDS = 600
+
+
+def audio_on_device(audio: np.ndarray, device) -> "torch.Tensor":
+    """
+    Wrap decoded 16 kHz float32 PCM for model.transcribe.
+
+    On CUDA the log-mel pass runs on the GPU instead of in FP32 on the CPU
+    (audio over MAX_GPU_SECONDS stays on the CPU); on CPU this is a zero-copy
+    view. Either way whisper skips its own ffmpeg decode of the file.
+    """
+    tensor = torch.from_numpy(audio)
+    if torch.device(device).type == "cpu" or len(audio) > MAX_GPU_SECONDS * SAMPLE_RATE:
+        return tensor
+    return tensor.to(device)
+
+
+class AudioStager:
+    """
+    Reusable pinned host + device buffers for moving PCM to the GPU.
+
+    Buffers grow to the longest clip seen (up to MAX_GPU_SECONDS) and are reused,
+    so back-to-back files don't each allocate fresh pinned/device memory.
+    Longer clips stay on the CPU (see audio_on_device).
+    """
+
+    def __init__(self, device="cuda"):
+        self.device = torch.device(device)
+        self.host = None
+        self.dev = None
+
+    def stage(self, audio: np.ndarray) -> "torch.Tensor":
+        """Copy audio into the staged device buffer and return a view of it."""
+        n = len(audio)
+        if n > MAX_GPU_SECONDS * SAMPLE_RATE:
+            return torch.from_numpy(audio)
+        
+        if self.host is None or self.host.numel() < n:
+            self.host = torch.empty(n, dtype=torch.float32, pin_memory=True)
+            self.dev = torch.empty(n, dtype=torch.float32, device=self.device)
+        
+        self.host[:n].copy_(torch.from_numpy(audio))
+        staged = self.dev[:n]
+        staged.copy_(self.host[:n], non_blocking=True)
+        return staged
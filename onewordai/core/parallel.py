@@ -0,0 +1,102 @@
+"""
+Multi-process transcription of long audio.
+Audio is cut at quiet points into one chunk per worker; each worker process
+keeps its own loaded model and transcribes its chunks independently.
+"""
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Worker pools kept alive between calls: (model_name, workers) -> executor
+_POOLS: Dict[Tuple[str, int], ProcessPoolExecutor] = {}
+
+# Model loaded once per worker process (set by _init_worker)
+_worker_generator = None
+
+
+def find_silence_cuts(
+    audio: np.ndarray,
+    n_chunks: int,
+    search_seconds: float = 10.0,
+    frame_ms: int = 30
+) -> List[int]:
+    """
+    Sample indices splitting audio into n_chunks roughly equal parts.
+
+    Each cut is moved to the quietest frame (lowest RMS energy) within
+    search_seconds of the even split point, so words are rarely cut in half.
+    """
+    frame = SAMPLE_RATE * frame_ms // 1000
+    n_frames = len(audio) // frame
+    if n_chunks < 2 or n_frames < n_chunks:
+        return []
+
+    # Per-frame energy for the whole file in one pass
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    energy = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+    radius = int(search_seconds * 1000 / frame_ms)
+    cuts = []
+    for i in range(1, n_chunks):
+        target = n_frames * i // n_chunks
+        lo = max(target - radius, (cuts[-1] // frame) + 1 if cuts else 1)
+        hi = min(target + radius, n_frames - 1)
+        if lo >= hi:
+            continue
+        quietest = lo + int(np.argmin(energy[lo:hi]))
+        cuts.append(quietest * frame + frame // 2)
+    return cuts
+
+
+def _init_worker(model_name: str, threads: int):
+    """Pin the worker's thread count, then load its model once."""
+    global _worker_generator
+    os.environ["ONEWORD_THREADS"] = str(threads)
+    from .engine import SubtitleGenerator
+    _worker_generator = SubtitleGenerator(model_name, verbose=False)
+    _worker_generator.load_model()
+
+
+def _transcribe_chunk(offset: float, audio: np.ndarray, language: Optional[str], quality: str):
+    """Transcribe one chunk in a worker process; returns (offset, result)."""
+    return offset, _worker_generator.transcribe_audio(audio, language, quality)
+
+
+def get_pool(model_name: str, workers: int) -> ProcessPoolExecutor:
+    """Worker pool for model_name, created (and its models loaded) on first use."""
+    key = (model_name, workers)
+    if key not in _POOLS:
+        from .threads import NUM_THREADS
+        # spawn: CUDA and already-started torch thread pools don't survive fork
+        _POOLS[key] = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, max(1, NUM_THREADS // workers))
+        )
+    return _POOLS[key]
+
+
+def shift_result(result: dict, offset: float) -> dict:
+    """Move every segment and word timestamp in a result later by offset seconds."""
+    for segment in result["segments"]:
+        segment["start"] += offset
+        segment["end"] += offset
+        for word in segment.get("words", []):
+            word["start"] += offset
+            word["end"] += offset
+    return result
+
+
+@atexit.register
+def shutdown_pools():
+    """Stop all worker processes."""
+    for pool in _POOLS.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _POOLS.clear()
@@ -0,0 +1,81 @@
+"""
+SRT formatting helpers.
+Timestamps are computed for whole arrays of cues at once.
+"""
+from typing import Callable, Dict, List, Sequence, Tuple
+import numpy as np
+
+# Characters dropped from subtitle words (one C-level translate instead of replace chains)
+STRIP_CHARS = str.maketrans("", "", ",")
+
+
+def format_timestamps(seconds: Sequence[float]) -> List[str]:
+    """Convert an array of seconds to SRT timestamps (HH:MM:SS,mmm)."""
+    # Round to microseconds first (like datetime.timedelta) so 1.001 -> 1,001 not 1,000
+    micros = np.round(np.asarray(seconds, dtype=np.float64) * 1_000_000).astype(np.int64)
+    hours, rest = np.divmod(micros // 1000, 3_600_000)
+    minutes, rest = np.divmod(rest, 60_000)
+    secs, millis = np.divmod(rest, 1000)
+    return [
+        f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+        for h, m, s, ms in zip(hours.tolist(), minutes.tolist(), secs.tolist(), millis.tolist())
+    ]
+
+
+def build_srt(
+    starts: Sequence[float],
+    ends: Sequence[float],
+    texts: Sequence[str],
+    first: int = 1
+) -> str:
+    """Build SRT entries from parallel start/end/text arrays, numbered from `first`."""
+    return "".join(
+        f"{counter}\n{start} --> {end}\n{text}\n\n"
+        for counter, (start, end, text) in enumerate(
+            zip(format_timestamps(starts), format_timestamps(ends), texts), first
+        )
+    )
+
+
+# Cue arrays for one segment: (starts, ends, texts)
+Cues = Tuple[List[float], List[float], List[str]]
+
+
+def oneword_cues(segment: dict) -> Cues:
+    """One word per subtitle, with commas stripped and empty words dropped."""
+    # Split the word dicts into parallel start/end/text lists, cleaning every word once
+    words = segment["words"]
+    cleaned = [w["word"].translate(STRIP_CHARS).strip() for w in words]
+    keep = [i for i, word in enumerate(cleaned) if word]
+    return (
+        [words[i]["start"] for i in keep],
+        [words[i]["end"] for i in keep],
+        [cleaned[i] for i in keep]
+    )
+
+
+def twoword_cues(segment: dict) -> Cues:
+    """Two words per subtitle (punch effect): first word's start, last word's end."""
+    starts, ends, texts = oneword_cues(segment)
+    n = len(texts)
+    return (
+        starts[::2],
+        ends[1::2] + ends[-1:] if n % 2 else ends[1::2],
+        [" ".join(texts[i:i+2]) for i in range(0, n, 2)]
+    )
+
+
+def phrase_cues(segment: dict) -> Cues:
+    """Full segment text as one subtitle."""
+    text = segment["text"].translate(STRIP_CHARS).strip()
+    if not text:
+        return [], [], []
+    return [segment["start"]], [segment["end"]], [text]
+
+
+# Subtitle mode -> cue builder (looked up once per file, not per segment)
+CUE_BUILDERS: Dict[str, Callable[[dict], Cues]] = {
+    "oneword": oneword_cues,
+    "twoword": twoword_cues,
+    "phrase": phrase_cues,
+}
@@ -0,0 +1,61 @@
+"""
+CPU thread configuration.
+Import before torch/whisper so OpenMP and MKL pick up one thread count, and
+call configure_torch() once torch is imported. Override with ONEWORD_THREADS.
+"""
+import os
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects taskset/cgroup affinity)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # sched_getaffinity is Linux-only
+        return os.cpu_count() or 4
+
+
+def performance_cpus() -> int:
+    """
+    Usable CPUs, counting only the fastest cores on big.LITTLE / hybrid chips.
+    
+    Spreading a GEMM over slow efficiency cores makes every step wait for
+    the stragglers, so only cores within 80% of the top cpufreq are counted
+    (per-core turbo bins differ by a few percent, E-cores by 25%+). Falls
+    back to all usable CPUs when frequencies can't be read.
+    """
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return available_cpus()
+    
+    freqs = []
+    for cpu in cpus:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/cpuinfo_max_freq") as f:
+                freqs.append(int(f.read()))
+        except (OSError, ValueError):
+            return len(cpus)
+    
+    if not freqs:
+        return len(cpus)
+    top = max(freqs)
+    return sum(1 for freq in freqs if freq >= 0.8 * top)
+
+
+NUM_THREADS = int(os.environ.get("ONEWORD_THREADS", "0")) or performance_cpus()
+
+os.environ.setdefault("OMP_NUM_THREADS", str(NUM_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(NUM_THREADS))
+
+
+def configure_torch():
+    """Apply NUM_THREADS to torch (imports torch; call before loading a model)."""
+    import torch
+    torch.set_num_threads(NUM_THREADS)
+    try:
+        # Whisper's graph is sequential; a second inter-op pool only oversubscribes the cores
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Inter-op pool already started (torch did parallel work before this call)
+        pass
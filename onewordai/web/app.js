@@ -7,6 +7,7 @@
 let uploadedFileId = null;
 let currentJobId = null;
 let pollingInterval = null;
+let statusStream = null;
 
 // ========== DOM ELEMENTS ==========
 const dropzone = document.getElementById('dropzone');
@@ -29,6 +30,7 @@ const closePopup = document.getElementById('closePopup');
 const modelSelect = document.getElementById('modelSelect');
 const languageSelect = document.getElementById('languageSelect');
 const modeSelect = document.getElementById('modeSelect');
+const qualitySelect = document.getElementById('qualitySelect');
 
 // Prevent accidental page reload during processing
 let isProcessing = false;
@@ -88,13 +90,12 @@ async function handleFile(file) {
     statusText.textContent = 'Uploading...';
     progressCard.classList.remove('hidden');
 
-    const formData = new FormData();
-    formData.append('file', file);
-
     try {
-        const response = await fetch('/api/upload', {
+        // Send the file as the raw body (no multipart encoding or server-side spooling)
+        const response = await fetch('/api/upload_raw?filename=' + encodeURIComponent(file.name), {
             method: 'POST',
-            body: formData
+            headers: { 'Content-Type': 'application/octet-stream' },
+            body: file
         });
 
         if (!response.ok) {
@@ -133,6 +134,7 @@ processBtn.addEventListener('click', async () => {
     const model = modelSelect.value;
     const language = languageSelect.value || null;
     const mode = modeSelect.value;
+    const quality = qualitySelect.value;
 
     // Start processing
     const formData = new FormData();
@@ -142,6 +144,7 @@ processBtn.addEventListener('click', async () => {
         formData.append('language', language);
     }
     formData.append('mode', mode);
+    formData.append('quality', quality);
 
     try {
         const response = await fetch('/api/process', {
@@ -172,10 +175,29 @@ processBtn.addEventListener('click', async () => {
 // ========== POLLING ==========
 let simulatedProgress = 0;
 
-function startPolling() {
-    simulatedProgress = 0;
+function handleJobUpdate(job) {
+    // Update UI
+    updateProgress(job);
+
+    // Check if complete
+    if (job.status === 'completed') {
+        stopPolling();
+        // Force 100% just in case
+        progressFill.style.width = '100%';
+        progressText.textContent = '100%';
+        setTimeout(() => showDownload(), 500);
+    } else if (job.status === 'failed') {
+        stopPolling();
+        alert('Processing failed: ' + job.error);
+        resetUI();
+    } else if (job.status === 'cancelled') {
+        stopPolling();
+        alert('Process was cancelled.');
+        resetUI();
+    }
+}
 
-    // Status polling
+function startStatusPolling() {
     pollingInterval = setInterval(async () => {
         try {
             const response = await fetch(`/api/status/${currentJobId}`);
@@ -191,32 +213,30 @@ function startPolling() {
                 throw new Error('Status check failed');
             }
 
-            const job = await response.json();
-
-            // Update UI
-            updateProgress(job);
-
-            // Check if complete
-            if (job.status === 'completed') {
-                stopPolling();
-                // Force 100% just in case
-                progressFill.style.width = '100%';
-                progressText.textContent = '100%';
-                setTimeout(() => showDownload(), 500);
-            } else if (job.status === 'failed') {
-                stopPolling();
-                alert('Processing failed: ' + job.error);
-                resetUI();
-            } else if (job.status === 'cancelled') {
-                stopPolling();
-                alert('Process was cancelled.');
-                resetUI();
-            }
+            handleJobUpdate(await response.json());
 
         } catch (error) {
             console.error('Polling error:', error);
         }
     }, 1000);
+}
+
+function startPolling() {
+    simulatedProgress = 0;
+
+    // Server pushes status updates; fall back to polling if streaming isn't available
+    if (window.EventSource) {
+        statusStream = new EventSource(`/api/stream/${currentJobId}`);
+        statusStream.onmessage = (event) => handleJobUpdate(JSON.parse(event.data));
+        statusStream.onerror = () => {
+            if (!statusStream) return;
+            statusStream.close();
+            statusStream = null;
+            startStatusPolling();
+        };
+    } else {
+        startStatusPolling();
+    }
 
     // Simulation interval remains the same
     simulationInterval = setInterval(() => {
@@ -258,6 +278,10 @@ cancelBtn.addEventListener('click', async () => {
 });
 
 function stopPolling() {
+    if (statusStream) {
+        statusStream.close();
+        statusStream = null;
+    }
     if (pollingInterval) {
         clearInterval(pollingInterval);
         pollingInterval = null;
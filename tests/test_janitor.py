@@ -0,0 +1,26 @@
+"""Expired upload/output cleanup."""
+import os
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+
+def test_sweep_removes_expired_files_and_skips_missing_dirs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from onewordai.api import main
+
+    uploads = tmp_path / "uploads"
+    old, fresh = uploads / "old.mp3", uploads / "fresh.mp3"
+    old.write_bytes(b"x")
+    fresh.write_bytes(b"x")
+    expired = time.time() - main.JOB_TTL - 60
+    os.utime(old, (expired, expired))
+
+    monkeypatch.setattr(main, "UPLOAD_DIR", uploads)
+    monkeypatch.setattr(main, "OUTPUT_DIR", tmp_path / "missing")
+    main.sweep_files()
+
+    assert not old.exists()
+    assert fresh.exists()
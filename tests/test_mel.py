@@ -0,0 +1,17 @@
+"""Placement of decoded audio for Whisper's log-mel pass."""
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+from onewordai.core.mel import AudioStager, MAX_GPU_SECONDS, SAMPLE_RATE, audio_on_device
+
+
+def test_long_audio_stays_on_cpu():
+    audio = np.zeros((MAX_GPU_SECONDS + 1) * SAMPLE_RATE, dtype=np.float32)
+    assert audio_on_device(audio, "cuda").device.type == "cpu"
+    assert AudioStager("cpu").stage(audio).device.type == "cpu"
+
+
+def test_short_audio_on_cpu_is_a_view():
+    audio = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    assert audio_on_device(audio, "cpu").data_ptr() == audio.ctypes.data
@@ -0,0 +1,31 @@
+"""Shared model cache locking."""
+import threading
+
+from onewordai.core.engine import SubtitleGenerator
+
+
+def test_cache_hit_not_blocked_by_another_models_load(monkeypatch):
+    SubtitleGenerator.clear_cache()
+    SubtitleGenerator._MODEL_CACHE["cached"] = ("cached-model", "openai")
+    started, release = threading.Event(), threading.Event()
+
+    def slow_load(self, status_callback=None):
+        started.set()
+        release.wait(5)
+        self.model, self.model_type = "slow-model", "openai"
+
+    monkeypatch.setattr(SubtitleGenerator, "_load_backend", slow_load)
+
+    loader = threading.Thread(target=SubtitleGenerator("slow").load_model)
+    loader.start()
+    try:
+        assert started.wait(5)
+        # The slow load is still in flight; a hit for another model must return at once
+        hit = threading.Thread(target=SubtitleGenerator("cached").load_model)
+        hit.start()
+        hit.join(1)
+        assert not hit.is_alive()
+    finally:
+        release.set()
+        loader.join(5)
+        SubtitleGenerator.clear_cache()
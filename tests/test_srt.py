@@ -0,0 +1,70 @@
+"""SRT cue building and timestamp formatting."""
+import datetime
+
+import pytest
+
+from onewordai.core.engine import SubtitleGenerator
+from onewordai.core.srt import build_srt, format_timestamps, oneword_cues, twoword_cues
+
+
+def timedelta_timestamp(seconds: float) -> str:
+    """The original datetime.timedelta-based SubtitleGenerator.format_timestamp."""
+    td = datetime.timedelta(seconds=seconds)
+    total_seconds = int(td.total_seconds())
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    secs = total_seconds % 60
+    millis = int(td.microseconds / 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def segment(*words):
+    return {"words": [{"word": w, "start": float(i), "end": i + 0.5} for i, w in enumerate(words)]}
+
+
+EDGE_SECONDS = [0.0, 0.0005, 1.001, 59.9995, 59.9999996, 61.25, 3599.9996, 3600.0, 7322.123456, 35999.9994]
+
+
+@pytest.mark.parametrize("seconds", EDGE_SECONDS)
+def test_timestamps_match_timedelta_formatting(seconds):
+    expected = timedelta_timestamp(seconds)
+    assert SubtitleGenerator.format_timestamp(seconds) == expected
+    assert format_timestamps([seconds]) == [expected]
+
+
+def test_format_timestamps_whole_array():
+    assert format_timestamps(EDGE_SECONDS) == [timedelta_timestamp(s) for s in EDGE_SECONDS]
+
+
+def test_oneword_strips_commas_and_drops_empty_words():
+    starts, ends, texts = oneword_cues(segment(" Hello,", " ,", " world", "  "))
+    assert texts == ["Hello", "world"]
+    assert starts == [0.0, 2.0]
+    assert ends == [0.5, 2.5]
+
+
+def test_twoword_even_word_count():
+    starts, ends, texts = twoword_cues(segment(" a", " b", " c", " d"))
+    assert texts == ["a b", "c d"]
+    assert starts == [0.0, 2.0]
+    assert ends == [1.5, 3.5]
+
+
+def test_twoword_odd_word_count_keeps_last_word_alone():
+    starts, ends, texts = twoword_cues(segment(" a", " b", " c"))
+    assert texts == ["a b", "c"]
+    assert starts == [0.0, 2.0]
+    assert ends == [1.5, 2.5]
+
+
+def test_twoword_pairs_after_dropping_empty_words():
+    # The stripped-away "," must not take a slot in a pair
+    starts, ends, texts = twoword_cues(segment(" a", ",", " b", " c"))
+    assert texts == ["a b", "c"]
+    assert starts == [0.0, 3.0]
+    assert ends == [2.5, 3.5]
+
+
+def test_build_srt_numbers_entries_from_first():
+    srt = build_srt([0.0, 1.5], [1.0, 2.0], ["a", "b"], first=3)
+    assert srt == "3\n00:00:00,000 --> 00:00:01,000\na\n\n4\n00:00:01,500 --> 00:00:02,000\nb\n\n"
@@ -0,0 +1,91 @@
+"""Job status reporting (/api/status and /api/stream) with the in-memory store."""
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+
+class FakeGenerator:
+    """Stands in for SubtitleGenerator, reporting fractional progress like the real backends."""
+
+    def process(self, input_path, output_path, progress_callback=None, **kwargs):
+        for percent in (12.5, 37.25, 37.9, 99.99):
+            progress_callback(percent)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("1\n00:00:00,000 --> 00:00:00,500\nhi\n\n")
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    # main creates uploads/ and outputs/ in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    from onewordai.api import main
+    from onewordai.api.store import JobStore
+
+    monkeypatch.setattr(main, "jobs", JobStore())
+    monkeypatch.setattr(main, "PREWARM_MODEL", "")
+    monkeypatch.setattr(main, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(main, "get_generator", lambda model: FakeGenerator())
+    with TestClient(main.app) as client:
+        yield client, main
+
+
+def _create_job(main, job_id):
+    main.jobs.create(job_id, {"job_id": job_id, "status": "pending", "progress": 0, "mode": "oneword"})
+
+
+def test_fractional_progress_is_stored_as_whole_percents(api):
+    client, main = api
+    _create_job(main, "job-1")
+    seen = []
+    original_update = main.jobs.update
+
+    def record(job_id, **fields):
+        if "progress" in fields:
+            seen.append(fields["progress"])
+        original_update(job_id, **fields)
+
+    main.jobs.update = record
+    main.process_video_task("job-1", "in.mp3", "medium", None, "oneword")
+
+    # 37.25 and 37.9 collapse into one update
+    assert seen == [0, 12, 37, 99, 100]
+    status = client.get("/api/status/job-1")
+    assert status.status_code == 200
+    assert status.json()["status"] == "completed"
+
+
+def test_stream_follows_job_to_completion(api):
+    client, main = api
+    _create_job(main, "job-3")
+    threading.Timer(0.2, main.process_video_task, ("job-3", "in.mp3", "medium", None, "oneword")).start()
+
+    with client.stream("GET", "/api/stream/job-3") as response:
+        assert response.status_code == 200
+        events = [json.loads(line[len("data: "):]) for line in response.iter_lines() if line.startswith("data: ")]
+
+    assert events[0]["status"] == "pending"
+    assert events[-1]["status"] == "completed"
+    assert [e["progress"] for e in events if e["status"] == "processing"][-1] == 99
+
+
+def test_download_missing_srt_is_404(api, tmp_path):
+    client, main = api
+    output = tmp_path / "job-4.srt"
+    output.write_text("1\n00:00:00,000 --> 00:00:00,500\nhi\n\n", encoding="utf-8")
+    main.jobs.create("job-4", {
+        "job_id": "job-4", "status": "completed", "progress": 100, "mode": "oneword",
+        "output_file": str(output), "output_stat": list(output.stat())
+    })
+
+    response = client.get("/api/download/job-4")
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.text.startswith("1\n")
+
+    # Swept or deleted after the job finished, with the stale stat still cached
+    output.unlink()
+    assert client.get("/api/download/job-4").status_code == 404
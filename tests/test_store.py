@@ -0,0 +1,132 @@
+"""Redis job store, exercised through the API with fakeredis."""
+import asyncio
+import json
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+
+class PollingFakeAsyncRedis(fakeredis.FakeAsyncRedis):
+    """fakeredis' blocking BLMOVE ignores task cancellation, which hangs TestClient shutdown."""
+
+    async def blmove(self, first_list, second_list, timeout, src="LEFT", dest="RIGHT"):
+        deadline = time.monotonic() + timeout
+        while True:
+            payload = await self.lmove(first_list, second_list, src, dest)
+            if payload is not None or time.monotonic() >= deadline:
+                return payload
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def redis_store():
+    from onewordai.api.store import RedisJobStore, JOB_TTL
+
+    server = fakeredis.FakeServer()
+    store = RedisJobStore.__new__(RedisJobStore)
+    store.ttl = JOB_TTL
+    store.client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    store.aclient = PollingFakeAsyncRedis(server=server, decode_responses=True)
+    return store
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch, redis_store):
+    # main creates uploads/ and outputs/ in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    from onewordai.api import main
+
+    ran = []
+    monkeypatch.setattr(main, "jobs", redis_store)
+    monkeypatch.setattr(main, "PREWARM_MODEL", "")
+    monkeypatch.setattr(main, "FFPROBE", None)
+    monkeypatch.setattr(main, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(main, "process_video_task", lambda job_id, *args: ran.append(job_id))
+    with TestClient(main.app) as client:
+        yield client, ran
+
+
+def test_create_keeps_job_id_field(redis_store):
+    redis_store.create("job-1", {"job_id": "job-1", "status": "pending", "progress": 0})
+    assert redis_store.get("job-1") == {"job_id": "job-1", "status": "pending", "progress": 0}
+
+
+def test_process_creates_and_queues_job(api, redis_store):
+    client, ran = api
+    upload = client.post("/api/upload_raw?filename=clip.mp3", content=b"\0" * 1024)
+    assert upload.status_code == 200
+
+    response = client.post("/api/process", data={"file_id": upload.json()["file_id"], "mode": "twoword"})
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+
+    job = redis_store.get(job_id)
+    assert job["job_id"] == job_id
+    assert job["mode"] == "twoword"
+    assert client.get(f"/api/status/{job_id}").json()["status"] == "pending"
+
+    # The scheduler takes the job off the Redis queue
+    deadline = time.time() + 5
+    while job_id not in ran and time.time() < deadline:
+        time.sleep(0.05)
+    assert ran == [job_id]
+
+
+def _job(job_id):
+    return (job_id, f"{job_id}.mp3", "medium", None, "oneword", "fast")
+
+
+def test_reclaim_takes_only_jobs_of_dead_schedulers(redis_store):
+    from onewordai.api.store import RedisJobQueue
+
+    async def run():
+        alive, dead, rescuer = (RedisJobQueue(redis_store.aclient) for _ in range(3))
+        for queue in (alive, dead, rescuer):
+            await queue.heartbeat()
+        for job_id in ("a", "b"):
+            await alive.put(_job(job_id))
+        assert await alive.get() == _job("a")
+        assert await dead.get() == _job("b")
+
+        assert await rescuer.reclaim() == []
+        await redis_store.aclient.delete(f"scheduler:{dead.scheduler_id}")
+        assert await rescuer.reclaim() == [_job("b")]
+        # Already moved out of the dead scheduler's list
+        assert await rescuer.reclaim() == []
+
+    asyncio.run(run())
+
+
+def test_requeue_counts_retries_only_for_started_jobs(redis_store, monkeypatch):
+    from onewordai.api import main
+    from onewordai.api.store import RedisJobQueue, QUEUE_KEY
+
+    monkeypatch.setattr(main, "jobs", redis_store)
+    monkeypatch.setattr(main, "MAX_JOB_RETRIES", 2)
+    redis_store.create("started", {"job_id": "started", "status": "processing", "retries": 0})
+    redis_store.create("waiting", {"job_id": "waiting", "status": "pending"})
+    redis_store.create("flaky", {"job_id": "flaky", "status": "processing", "retries": 2})
+    redis_store.create("done", {"job_id": "done", "status": "completed"})
+
+    async def run():
+        dead = RedisJobQueue(redis_store.aclient)
+        keeper = RedisJobQueue(redis_store.aclient)
+        monkeypatch.setattr(main, "job_queue", keeper)
+        await keeper.heartbeat()
+        for job_id in ("started", "waiting", "flaky", "done"):
+            await dead.put(_job(job_id))
+            await dead.get()
+        await main.requeue_orphans()
+        return await redis_store.aclient.lrange(QUEUE_KEY, 0, -1)
+
+    requeued = [json.loads(payload)[0] for payload in asyncio.run(run())]
+    assert requeued == ["started", "waiting"]
+    assert redis_store.get("started")["retries"] == 1
+    assert redis_store.get("started")["status"] == "pending"
+    assert redis_store.get("waiting")["retries"] == 0
+    assert redis_store.get("flaky")["status"] == "failed"
+    assert redis_store.get("done")["status"] == "completed"